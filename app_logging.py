@@ -0,0 +1,55 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+Logging setup for the whole application.
+Every module logs through its own named logger (logging.getLogger(__name__)).
+Records are put on a queue and written to the console by a background thread, so the listener
+thread never blocks on I/O, and the level can be changed while the app is running.
+Disabled levels cost a single level check, as the message is only formatted once it's enabled.
+"""
+
+import logging
+import logging.handlers
+import queue
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s [%(threadName)s] %(name)s: %(message)s"
+
+_queue_listener = None
+
+
+def setup_logging(level=logging.INFO):
+    """Route every logger through a queue that is drained by a background thread."""
+    global _queue_listener
+    if _queue_listener:
+        set_log_level(level)
+        return
+
+    log_queue = queue.SimpleQueue()
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _queue_listener = logging.handlers.QueueListener(log_queue, console_handler)
+    _queue_listener.start()
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    set_log_level(level)
+
+
+def set_log_level(level):
+    """Change the level at run time, accepts a logging constant or its name ("DEBUG")."""
+    if isinstance(level, str):
+        level = level.upper()
+    logging.getLogger().setLevel(level)
+
+
+def get_log_level():
+    return logging.getLogger().getEffectiveLevel()
+
+
+def stop_logging():
+    """Flush the queue and stop the background thread."""
+    global _queue_listener
+    if _queue_listener:
+        _queue_listener.stop()
+        _queue_listener = None
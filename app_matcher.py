@@ -0,0 +1,124 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+The app matcher finds which of the running apps' names appear in a window title.
+All the names are compiled once into an Aho-Corasick automaton, so a title is scanned a single time
+whatever the number of apps, instead of running one regex per app.
+Matches follow the same rules as re.search(r"\b" + re.escape(name) + r"\b", title, re.IGNORECASE),
+and the result of every title is memoized until the set of apps changes.
+"""
+
+import re
+
+# Titles seen while the apps stay the same, cleared past this size (browser titles keep changing)
+MAX_CACHED_TITLES = 4096
+
+
+def is_word_char(char):
+    # Same as the \w class of str patterns
+    return char.isalnum() or char == "_"
+
+
+class AppNameMatcher:
+    def __init__(self, app_names=()):
+        self.app_names = ()
+        self.goto = []  # node -> {char: node}
+        self.fail = []  # node -> longest proper suffix node
+        self.outputs = []  # node -> list of app indices ending at this node
+        self.lengths = []  # app index -> length of its lowered name
+        self.patterns = []  # app index -> compiled regex, for the odd unicode cases
+        self.regex_only = []  # app indices whose lowered name changed length
+        self.title_cache = {}
+        self.set_app_names(app_names)
+
+    def set_app_names(self, app_names):
+        """Rebuild the automaton, only when the names actually changed."""
+        # Duplicates and empty names (an app called ".exe") can never change the result
+        app_names = tuple(dict.fromkeys(name for name in app_names if name))
+        if app_names == self.app_names:
+            return
+        self.app_names = app_names
+        self.title_cache = {}
+        self.build_automaton()
+
+    def build_automaton(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.patterns = []
+        self.regex_only = []
+        self.lengths = []
+        for index, name in enumerate(self.app_names):
+            self.patterns.append(
+                re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
+            )
+            lowered = name.lower()
+            self.lengths.append(len(lowered))
+            if len(lowered) != len(name):
+                self.regex_only.append(index)
+                continue
+            node = 0
+            for char in lowered:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.outputs[node].append(index)
+
+        # Breadth first, so a node's fail link is resolved before its children need it
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.outputs[child] = (
+                    self.outputs[child] + self.outputs[self.fail[child]]
+                )
+
+    def match(self, title):
+        """Return the app names found in the title, in the order they were given."""
+        matches = self.title_cache.get(title)
+        if matches is None:
+            matches = self.match_uncached(title)
+            if len(self.title_cache) >= MAX_CACHED_TITLES:
+                self.title_cache = {}
+            self.title_cache[title] = matches
+        return matches
+
+    def match_uncached(self, title):
+        lowered = title.lower()
+        if len(lowered) != len(title):
+            # Some characters lower to several, so positions wouldn't line up with the title
+            return tuple(
+                name
+                for name, pattern in zip(self.app_names, self.patterns)
+                if pattern.search(title)
+            )
+
+        found = {
+            index for index in self.regex_only if self.patterns[index].search(title)
+        }
+        node = 0
+        for end, char in enumerate(lowered):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for index in self.outputs[node]:
+                if index in found:
+                    continue
+                start = end - self.lengths[index] + 1
+                if self.is_boundary(title, start) and self.is_boundary(title, end + 1):
+                    found.add(index)
+        return tuple(self.app_names[index] for index in sorted(found))
+
+    def is_boundary(self, text, position):
+        """Emulates \\b, a word character on exactly one side of the position."""
+        before = position > 0 and is_word_char(text[position - 1])
+        after = position < len(text) and is_word_char(text[position])
+        return before != after
@@ -0,0 +1,97 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+The detector command queue runs WindowDetector calls on the detector thread, so a slow window manager
+call or process scan never stalls the GUI.
+Commands are ordered by priority (hotkeys ahead of background work), first in first out within the
+same priority. Every command returns a Future that can be cancelled while it's still waiting,
+and its optional on_done callback is called back on the thread that created the queue.
+"""
+
+from PySide6.QtCore import QObject, Signal
+from concurrent.futures import Future
+import heapq
+import itertools
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITY_HOTKEY = 0
+PRIORITY_BACKGROUND = 10
+
+
+class DetectorCommandRunner(QObject):
+    """Lives on the detector thread and runs the queued commands one at a time."""
+
+    command_done = Signal(object)
+
+    def __init__(self, command_queue):
+        super().__init__()
+        self.command_queue = command_queue
+
+    def run_next_command(self):
+        if not (command := self.command_queue.pop_command()):
+            return
+        future = command["future"]
+        # False when it was cancelled while waiting in the queue
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = command["function"](*command["args"], **command["kwargs"])
+        except Exception as e:
+            logger.exception("Detector command %s failed", command["name"])
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        if command["on_done"]:
+            self.command_done.emit(command)
+
+
+class DetectorCommandQueue(QObject):
+    command_added = Signal()
+
+    def __init__(self, detector_thread):
+        super().__init__()
+        # (priority, sequence, command), the sequence keeps equal priorities in FIFO order
+        self.commands = []
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+
+        self.runner = DetectorCommandRunner(self)
+        self.runner.moveToThread(detector_thread)
+        # One run per submitted command, queued to the detector thread
+        self.command_added.connect(self.runner.run_next_command)
+        # Back to this queue's thread for the on_done callbacks
+        self.runner.command_done.connect(self.deliver_command_done)
+
+    def submit(self, function, *args, priority=PRIORITY_HOTKEY, on_done=None, **kwargs):
+        """Queue function(*args, **kwargs) for the detector thread, returns its Future."""
+        future = Future()
+        command = {
+            "name": getattr(function, "__name__", repr(function)),
+            "function": function,
+            "args": args,
+            "kwargs": kwargs,
+            "future": future,
+            "on_done": on_done,
+        }
+        with self.lock:
+            heapq.heappush(self.commands, (priority, next(self.sequence), command))
+        self.command_added.emit()
+        return future
+
+    def pop_command(self):
+        with self.lock:
+            if not self.commands:
+                return None
+            return heapq.heappop(self.commands)[2]
+
+    def cancel_all(self):
+        """Cancel every command that didn't start yet."""
+        with self.lock:
+            for _, _, command in self.commands:
+                command["future"].cancel()
+
+    def deliver_command_done(self, command):
+        command["on_done"](command["future"])
@@ -10,6 +10,9 @@ from appdirs import AppDirs
 import datetime
 import os
 import platform
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class UserConfig:
@@ -62,14 +65,16 @@ class UserConfig:
         # Check if macOS
         if platform.system() == "Darwin":
             self.ctrl_name = "ctrl"
+            self.alt_name = "alt"
         else:
             self.ctrl_name = "ctrl_l"
+            self.alt_name = "alt_l"
 
         # Check if the configuration file already exists
         if not os.path.exists(config_path):
 
             # If files do not exist -> Create the default config.ini and preferences.ini files
-            print("Configuration file not found. Setting up...")
+            logger.info("Configuration file not found. Setting up...")
             os.makedirs(config_dir, exist_ok=True)
 
             # Write the initial configuration file
@@ -108,35 +113,53 @@ class UserConfig:
                         "close all windows 1": f"{self.ctrl_name}+shift+1+delete",
                         "maximize window 1": f"{self.ctrl_name}+shift+1+plus",
                         "minimize window 1": f"{self.ctrl_name}+shift+1+-",
+                        "minimize all except window 1": f"{self.ctrl_name}+shift+1+end",
                         "ctrl window 2": f"{self.ctrl_name}+shift+2",
                         "open window 2": f"{self.ctrl_name}+shift+2+enter",
                         "close window 2": f"{self.ctrl_name}+shift+2+backspace",
                         "close all windows 2": f"{self.ctrl_name}+shift+2+delete",
                         "maximize window 2": f"{self.ctrl_name}+shift+2+plus",
                         "minimize window 2": f"{self.ctrl_name}+shift+2+-",
+                        "minimize all except window 2": f"{self.ctrl_name}+shift+2+end",
                         "ctrl window 3": f"{self.ctrl_name}+shift+3",
                         "open window 3": f"{self.ctrl_name}+shift+3+enter",
                         "close window 3": f"{self.ctrl_name}+shift+3+backspace",
                         "close all windows 3": f"{self.ctrl_name}+shift+3+delete",
                         "maximize window 3": f"{self.ctrl_name}+shift+3+plus",
                         "minimize window 3": f"{self.ctrl_name}+shift+3+-",
+                        "minimize all except window 3": f"{self.ctrl_name}+shift+3+end",
                         "ctrl window 4": f"{self.ctrl_name}+shift+4",
                         "open window 4": f"{self.ctrl_name}+shift+4+enter",
                         "close window 4": f"{self.ctrl_name}+shift+4+backspace",
                         "close all windows 4": f"{self.ctrl_name}+shift+4+delete",
                         "maximize window 4": f"{self.ctrl_name}+shift+4+plus",
                         "minimize window 4": f"{self.ctrl_name}+shift+4+-",
+                        "minimize all except window 4": f"{self.ctrl_name}+shift+4+end",
                         "ctrl window 5": f"{self.ctrl_name}+shift+5",
                         "open window 5": f"{self.ctrl_name}+shift+5+enter",
                         "close window 5": f"{self.ctrl_name}+shift+5+backspace",
                         "close all windows 5": f"{self.ctrl_name}+shift+5+delete",
                         "maximize window 5": f"{self.ctrl_name}+shift+5+plus",
                         "minimize window 5": f"{self.ctrl_name}+shift+5+-",
+                        "minimize all except window 5": f"{self.ctrl_name}+shift+5+end",
                         "open last active window": f"{self.ctrl_name}+shift+=",
+                        "switch to recent window 2": f"{self.ctrl_name}+shift+=+2",
+                        "switch to recent window 3": f"{self.ctrl_name}+shift+=+3",
                         "close active window": f"{self.ctrl_name}+shift+-",
                         "maximize active window": f"{self.ctrl_name}+shift+up",
                         "minimize active window": f"{self.ctrl_name}+shift+down",
                         "exit program": f"{self.ctrl_name}+shift+q",
+                        "dump latency stats": f"{self.ctrl_name}+shift+l",
+                        "open quick switcher": f"{self.ctrl_name}+shift+space",
+                        "save workspace 1": f"{self.ctrl_name}+{self.alt_name}+shift+1",
+                        "restore workspace 1": f"{self.ctrl_name}+{self.alt_name}+1",
+                        "save workspace 2": f"{self.ctrl_name}+{self.alt_name}+shift+2",
+                        "restore workspace 2": f"{self.ctrl_name}+{self.alt_name}+2",
+                        "save workspace 3": f"{self.ctrl_name}+{self.alt_name}+shift+3",
+                        "restore workspace 3": f"{self.ctrl_name}+{self.alt_name}+3",
+                    },
+                    "Keyboard Settings": {
+                        "chord timeout": "0.3",
                     },
                     "Window Names": {
                         "Window 1": "None",
@@ -163,17 +186,19 @@ class UserConfig:
             self.GOD["user"]["first_time"] = True
 
         else:
-            print("Configuration file found. Loading settings...")
+            logger.info("Configuration file found. Loading settings...")
             # Read from the config file
             config_file = self.read_config_file(config_path)
             preferences_file = self.read_config_file(preferences_path)
+            cache_file = self.read_config_file(cache_path)
 
             if config_file and preferences_file:
                 self.GOD["first_time"] = False
                 self.GOD["config.ini"]["file"] = config_file
                 self.GOD["preferences.ini"]["file"] = preferences_file
+                self.GOD["cache.ini"]["file"] = cache_file
             else:
-                print("No configuration content to display.")
+                logger.warning("No configuration content to display.")
 
     # def create_ini_file(filename, config_path, sections, section_data):
     def create_ini_file(self, filename, config_path, config_data):
@@ -203,9 +228,9 @@ class UserConfig:
             self.GOD[filename]["file"] = config
             self.GOD[filename]["last_updated"] = str(datetime.datetime.now())
 
-            print(f"Configuration written to {config_path}")
+            logger.info("Configuration written to %s", config_path)
         except IOError as e:
-            print(f"Failed to write to the configuration file: {e}")
+            logger.error("Failed to write to the configuration file: %s", e)
 
     # TODO - Not sure if needed (seems to be pointless as the file is alread read in the init function)
     def read_config_file(self, config_path):
@@ -215,37 +240,44 @@ class UserConfig:
             config.read(config_path)
             return config  # You can return the whole config object for further use
         except configparser.Error as e:
-            print(f"Failed to read the configuration file: {e}")
+            logger.error("Failed to read the configuration file: %s", e)
             return None
 
-    # TODO - make the function be more modular by passing the path and file depending on the operation
-    def update_ini_file(self, filename, updates):
+    def update_ini_file(self, filename, updates, replace_sections=False):
         """
-        Update an existing configuration file with new or updated settings.
+        Update an existing configuration file (e.g. "config.ini" or "cache.ini") with new or updated settings.
         'updates' is a dictionary where keys are section names, and values are dictionaries
         of setting names and their values.
+        With replace_sections, the updated sections drop the settings that aren't in 'updates'.
         """
-        config = self.GOD["config.ini"]["file"]
-        config_path = self.GOD["config.ini"]["path"]
+        config = self.GOD[filename]["file"]
+        config_path = self.GOD[filename]["path"]
+        if not isinstance(config, configparser.ConfigParser):
+            config = configparser.ConfigParser()
 
         # Check if the file exists to read existing configurations
         if os.path.exists(config_path):
             config.read(config_path)
         else:
-            print("Configuration file does not exist, creating a new one.")
+            logger.info("Configuration file does not exist, creating a new one.")
 
         # Update or add the new settings
         for section, settings in updates.items():
+            if replace_sections:
+                config.remove_section(section)
             if not config.has_section(section):
                 config.add_section(section)
             for key, value in settings.items():
                 config.set(section, key, value)
+        if not config.has_section("Last Updated"):
+            config.add_section("Last Updated")
         config.set("Last Updated", "DateTime", str(datetime.datetime.now()))
 
         # Write the updated configuration back to the file
+        os.makedirs(os.path.dirname(config_path), exist_ok=True)
         with open(config_path, "w", encoding="utf-8") as configfile:
             config.write(configfile)
-            print(f"Configuration updated and written to {config_path}")
+            logger.info("Configuration updated and written to %s", config_path)
             self.GOD[filename]["file"] = config
             self.GOD[filename]["last_updated"] = str(datetime.datetime.now())
 
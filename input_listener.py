@@ -4,13 +4,173 @@ The input listener catches the keyboard and mouse events and emits signals to th
 It is also incharge of executing the actions based on the keyboard shortcuts.
 It is designed in a non-blocking way, so that the main application can run smoothly.
 This is done by using Qt threads and signals.
+Both devices are listened to from a single InputHub thread, which queues their events in the
+order they happened and hands them to the KeyboardListener and MouseListener.
 """
 
 from PySide6.QtCore import QObject, Signal
 from pynput import keyboard, mouse
+from key_normalizer import KeyNormalizer, ESC_KEY, ENTER_KEY
+from collections import deque
 import configparser
+import logging
+import re
+import threading
 import time
 
+logger = logging.getLogger(__name__)
+
+# Modifier tokens may be held in any order, so chords are indexed on the set of them
+MODIFIER_KEYS = frozenset(
+    {
+        "ctrl",
+        "ctrl_l",
+        "ctrl_r",
+        "shift",
+        "shift_l",
+        "shift_r",
+        "alt",
+        "alt_l",
+        "alt_r",
+        "alt_gr",
+        "cmd",
+        "cmd_l",
+        "cmd_r",
+    }
+)
+
+# "<action> window <n>" bindings, e.g. "maximize window 7" or "close all windows 12"
+SLOT_ACTION_PATTERN = re.compile(r"^(?P<action>.+?) windows? (?P<slot>\d+)$")
+SLOT_ACTIONS = {
+    "ctrl": "ctrl",
+    "open": "open",
+    "close": "close",
+    "close all": "close_all",
+    "close all matching": "close_all",
+    "maximize": "maximize",
+    "minimize": "minimize",
+    "minimize all except": "minimize_others",
+    # The number is how many focus switches back, e.g. "switch to recent window 2"
+    "switch to recent": "switch_recent",
+}
+# "<save|restore> workspace <n>" bindings, the workspace number takes the slot's place
+WORKSPACE_ACTION_PATTERN = re.compile(
+    r"^(?P<action>save|restore) workspace (?P<slot>\d+)$"
+)
+# Bindings that don't follow the slot pattern, slot None means the listener handles it itself
+GLOBAL_ACTIONS = {
+    "configure window": (None, "configure_window"),
+    "exit program": (None, "exit_program"),
+    "dump latency stats": (None, "dump_latency_stats"),
+    "open quick switcher": (None, "quick_switcher"),
+    "toggle always on top": (1, "toggle_on_top"),
+    "open last active window": (1, "switch_recent"),
+}
+
+# The devices feeding the InputHub queue
+KEYBOARD_DEVICE = "keyboard"
+MOUSE_DEVICE = "mouse"
+
+
+class InputHub(QObject):
+    """
+    Runs the keyboard and mouse pynput listeners on one thread with a single event queue.
+    Events are stamped as they are queued, so key presses and clicks keep their exact order,
+    and they are processed one by one on the hub's thread.
+    Mouse moves skip the queue and go straight to the MouseListener's mailbox.
+    """
+
+    def __init__(self, keyboard_listener, mouse_listener):
+        super().__init__()
+        self.keyboard_listener = keyboard_listener
+        self.mouse_listener = mouse_listener
+        keyboard_listener.input_hub = self
+        mouse_listener.input_hub = self
+
+        self.can_run = True
+        # (device, event time, payload), filled by the pynput callbacks
+        self.events = deque()
+        self.condition = threading.Condition()
+
+    def run(self):
+        with keyboard.Listener(
+            on_press=self.on_press, on_release=self.on_release
+        ), mouse.Listener(on_move=self.mouse_listener.on_move, on_click=self.on_click):
+            while (event := self.wait_for_event()) is not None:
+                if not event:
+                    self.keyboard_listener.handle_deadlines()
+                    continue
+                if not self.dispatch_event(event):
+                    break
+
+    def shutdown(self):
+        with self.condition:
+            self.can_run = False
+            self.condition.notify()
+
+    def is_listening(self, device):
+        if device == KEYBOARD_DEVICE:
+            return self.keyboard_listener.listen_pynput
+        return self.mouse_listener.listen_mouse_pynput
+
+    def drop_events(self, device):
+        """Discard the queued events of a device that was paused."""
+        with self.condition:
+            self.events = deque(event for event in self.events if event[0] != device)
+
+    def on_press(self, key, injected=False):
+        self.enqueue_event(
+            KEYBOARD_DEVICE, True, self.keyboard_listener.key_normalizer.describe(key)
+        )
+
+    def on_release(self, key, injected=False):
+        self.enqueue_event(
+            KEYBOARD_DEVICE, False, self.keyboard_listener.key_normalizer.describe(key)
+        )
+
+    def on_click(self, x, y, button, pressed, injected=False):
+        if self.mouse_listener.listen_to_mouse_clicks:
+            self.enqueue_event(MOUSE_DEVICE, x, y, button, pressed)
+
+    def enqueue_event(self, device, *payload):
+        with self.condition:
+            if not self.can_run or not self.is_listening(device):
+                return
+            # Stamped under the lock, so the queue order and the timestamps always agree.
+            # The latency stats include the time spent in the queue as well.
+            self.events.append((device, time.perf_counter(), payload))
+            self.condition.notify()
+
+    def wait_for_event(self):
+        """
+        Block until an event arrives or the next keyboard deadline passes (returns an empty tuple).
+        Returns None once the hub is shut down.
+        """
+        with self.condition:
+            while self.can_run:
+                if self.events:
+                    return self.events.popleft()
+
+                timeout = None
+                if (deadline := self.keyboard_listener.get_next_deadline()) is not None:
+                    timeout = deadline - time.perf_counter()
+                    if timeout <= 0:
+                        return ()
+                self.condition.wait(timeout)
+        return None
+
+    def dispatch_event(self, event):
+        """Hand an event to its device's listener, returns False when the hub should exit."""
+        device, event_time, payload = event
+        if device == KEYBOARD_DEVICE:
+            pressed, key = payload
+            if self.keyboard_listener.key_recorder:
+                self.keyboard_listener.key_recorder.record(pressed, key, event_time)
+            return self.keyboard_listener.process_key_event(pressed, key, event_time)
+
+        self.mouse_listener.process_click(*payload)
+        return True
+
 
 class KeyboardListener(QObject):
     finished = Signal()
@@ -23,14 +183,19 @@ class KeyboardListener(QObject):
     configure_window = Signal()
     window_action = Signal(int, str)
     window_number_assignment = Signal(int)
+    latency_dump_requested = Signal()
+    quick_switcher_requested = Signal()
 
-    def __init__(self, config_file):
+    def __init__(self, config_file, latency_tracker=None):
         super().__init__()
         self.config_parser = configparser.ConfigParser()
         self.config_parser.read(config_file)
         self.user_shortcuts = {}
+        self.shortcuts_index = {}
+        self.actions_table = {}
+        self.ambiguous_chords = set()
 
-        print("Config file memory adderess: ", config_file)
+        logger.debug("Config file memory adderess: %s", config_file)
         self.create_user_shortcuts(config_file)
 
         # self.config.read("config.ini")
@@ -38,388 +203,346 @@ class KeyboardListener(QObject):
         self.hotkey_listener = True
         self.waiting_for_specific_input = False
         self.listen_pynput = True
-        self.can_run = True
         self.waiting_for_number_assignment = False
-
-        self.outcast_keys_map = {
-            "Þ": "'",
-            "Ü": "|",
-            "¿": "?",
-            "¾": ">",
-            "¼": "<",
-            "Ý": "}",
-            "Û": "{",
-            "º": ":",
-            "»": "+",
-        }
-        self.outcast_keys_regular_map = {"▲": "6", r"\x1f": "-"}
-        self.symbol_to_number = {
-            "!": "1",  # Shift+1 is !
-            "@": "2",  # Shift+2 is @
-            "#": "3",  # Shift+3 is #
-            "$": "4",  # Shift+4 is $
-            "%": "5",  # Shift+5 is %
-            "^": "6",  # Shift+6 is ^
-            "&": "7",  # Shift+7 is &
-            "*": "8",  # Shift+8 is *
-            "(": "9",  # Shift+9 is (
-            ")": "0",  # Shift+0 is )
-            "<": ",",  # Shift+, is <
-            ">": ".",  # Shift+. is >
-            "?": "/",  # Shift+/ is ?
-            ":": ";",  # Shift+; is :
-            '"': "'",  # Shift+' is "
-            "{": "[",  # Shift+[ is {
-            "}": "]",  # Shift+] is }
-            "|": "\\",  # Shift+\ is |
-            "_": "-",  # Shift+- is _
-            "+": "=",  # Shift+= is +
-            "~": "`",  # Shift+` is ~
-            r"'\x1f'": "-",
-        }
+        # While an overlay of ours takes the Esc key (the quick switcher), its release doesn't exit
+        self.esc_exit_paused = False
+        # The Esc that closed the overlay is still on its way, its release is swallowed too
+        self.resume_esc_exit_on_release = False
+        # The InputHub feeding this listener, None when driven directly (e.g. replay.py)
+        self.input_hub = None
+
+        self.key_normalizer = KeyNormalizer()
+        # Optional LatencyTracker, stamped when a chord is detected and its action is emitted
+        self.latency_tracker = latency_tracker
+        self.key_event_time = 0.0
+        self.combo_detected_time = 0.0
+        # Optional KeyEventRecorder (see replay.py), every event handled is written to it
+        self.key_recorder = None
         self.pressed_keys = {}
-        self.listener_loop = 0.25
-        self.is_active = 0
+        # Trigger keys of a chord that already fired, ignored until they are released
+        self.fired_keys = set()
+        # Held keys are dropped if no event arrives before this deadline (a release was missed)
+        self.stale_keys_timeout = 0.6
+        self.stale_keys_deadline = 0.0
+        # A chord that is a prefix of a longer one waits this long for it before firing
+        self.chord_timeout = config_file.getfloat(
+            "Keyboard Settings", "chord timeout", fallback=0.3
+        )
+        self.pending_chord_deadline = None
 
         # self.COMBOS = {"<49>": "Action1"}
         # Define your key combinations as frozensets for immutability and efficient comparison
 
     def create_user_shortcuts(self, config_file):
-        print("Reading config file...")
+        logger.info("Reading config file...")
         # Initialize user_shortcuts if it's not already
         self.user_shortcuts = {}
+        self.shortcuts_index = {}
+        self.actions_table = {}
+        self.ambiguous_chords = set()
 
         # Read "Keyboard Shortcuts" section
         for key, value in config_file.items("Keyboard Shortcuts"):
             # Split the value by '+' and replace 'plus' with '+'
             values = [v if v != "plus" else "+" for v in value.split("+")]
             self.user_shortcuts[key] = values
-        print(f"User Shortcuts: {self.user_shortcuts}")
+
+            # Index the chord by its signature, so detection is a single dict lookup
+            signature = self.get_chord_signature(values)
+            if signature in self.shortcuts_index:
+                logger.warning(
+                    "Shortcut '%s' conflicts with '%s', ignoring it.",
+                    key,
+                    self.shortcuts_index[signature],
+                )
+                continue
+            self.shortcuts_index[signature] = key
+
+            if action := self.parse_action(key):
+                self.actions_table[key] = action
+
+        # Chords that a longer binding starts with can't fire on press right away,
+        # e.g. ctrl+shift+1 has to wait in case ctrl+shift+1+enter is coming
+        for modifiers, triggers in self.shortcuts_index:
+            for length in range(len(triggers)):
+                self.ambiguous_chords.add((modifiers, triggers[:length]))
+        logger.debug("User Shortcuts: %s", self.user_shortcuts)
+
+    def parse_action(self, label):
+        """Translate a shortcut label into its (slot, action) pair, or None if it has no action."""
+        if label in GLOBAL_ACTIONS:
+            return GLOBAL_ACTIONS[label]
+        if match := SLOT_ACTION_PATTERN.match(label):
+            if action := SLOT_ACTIONS.get(match.group("action")):
+                return int(match.group("slot")), action
+        if match := WORKSPACE_ACTION_PATTERN.match(label):
+            return int(match.group("slot")), f"{match.group('action')}_workspace"
+        return None
+
+    def get_chord_signature(self, keys):
+        """Return the order-insensitive modifier set plus the ordered trigger keys."""
+        modifiers = []
+        triggers = []
+        for key in keys:
+            if key in MODIFIER_KEYS:
+                modifiers.append(key)
+            else:
+                triggers.append(key)
+        return frozenset(modifiers), tuple(triggers)
 
     def start_listener(self):
         self.listen_pynput = True
 
     def stop_listener(self):
         self.listen_pynput = False
+        if self.input_hub:
+            self.input_hub.drop_events(KEYBOARD_DEVICE)
+
+    def pause_esc_exit(self):
+        self.esc_exit_paused = True
+        self.resume_esc_exit_on_release = False
+
+    def resume_esc_exit(self, after_release=False):
+        """Let Esc exit again, after_release when the overlay was closed by an Esc press."""
+        if after_release:
+            self.resume_esc_exit_on_release = True
+        else:
+            self.esc_exit_paused = False
+
+    def stop_recording(self):
+        if self.key_recorder:
+            self.key_recorder.close()
+            self.key_recorder = None
 
     def get_listener_status(self):
         return self.listen_pynput
 
-    def on_keyboard_events_pynput(self):
-        with keyboard.Events() as events:
-            while self.can_run:
-                if not self.listen_pynput:
-                    time.sleep(1)
+    def get_next_deadline(self):
+        """The earliest of the pending chord and stale keys deadlines, None while idle."""
+        deadlines = []
+        if self.pending_chord_deadline is not None:
+            deadlines.append(self.pending_chord_deadline)
+        if self.pressed_keys or self.fired_keys:
+            deadlines.append(self.stale_keys_deadline)
+        return min(deadlines, default=None)
+
+    def handle_deadlines(self, now=None):
+        now = now or time.perf_counter()
+        if (
+            self.pending_chord_deadline is not None
+            and now >= self.pending_chord_deadline
+        ):
+            # No longer chord followed in time, so fire the one that is held
+            self.pending_chord_deadline = None
+            if detected_combo := self.detect_combinations():
+                self.execute_action(detected_combo)
+        if (self.pressed_keys or self.fired_keys) and now >= self.stale_keys_deadline:
+            # No event arrived in time, a release was probably missed
+            self.pressed_keys = {}
+            self.fired_keys.clear()
+
+    def process_key_event(self, pressed, key, event_time=None):
+        """Handle a single press/release of a key descriptor, returns False when the listener should exit."""
+        self.key_event_time = event_time or time.perf_counter()
+        self.stale_keys_deadline = self.key_event_time + self.stale_keys_timeout
+        if key == ESC_KEY and not pressed and self.esc_exit_paused:
+            if self.resume_esc_exit_on_release:
+                self.esc_exit_paused = False
+                self.resume_esc_exit_on_release = False
+            logger.debug("Esc release left to the overlay")
+            return True
+        if not self.waiting_for_specific_input:
+            # if self.waiting_for_number_assignment:
+            #     return
+            if (
+                pressed
+                and key not in self.pressed_keys
+                and key not in self.fired_keys
+                and not key == ESC_KEY
+            ):
+                self.pressed_since_released = True
+
+                key_token = self.key_normalizer.normalize(key)
+                logger.debug("Key pressed: %s", key_token)
+                self.key_print.emit(key_token)
+
+                # Only character keys can answer the number assignment
+                if self.waiting_for_number_assignment and key[1]:
+                    try:
+                        key_number = int(key_token)
+                    except (TypeError, ValueError):
+                        key_number = 99
+                    self.window_number_assignment.emit(key_number)
                 else:
-                    event = events.get(self.listener_loop)
-                    # print("Listener Loop")
-                    if event is None:
-                        # print("EVENT IS NONE")
-                        # print(f"Is Active: {self.is_active}")
-                        if self.is_active < 3:
-                            self.is_active += 1
-                        else:
-                            self.pressed_keys = {}
-                            self.listener_loop = 0.25
-                            self.is_active = 0
-
-                        continue
-                    else:
-                        # print("EVENT IS NOT NONE")
-                        self.listener_loop = 0.15
-                        self.is_active = 0
-
-                    if not self.waiting_for_specific_input:
-                        # if self.waiting_for_number_assignment:
-                        #     return
-                        if (
-                            isinstance(event, keyboard.Events.Press)
-                            and event.key not in self.pressed_keys
-                            and not event.key == keyboard.Key.esc
-                        ):
-                            key = event.key
-                            self.pressed_since_released = True
-
-                            # Check if the key is a KeyCode (which can have a char attribute)
-                            if hasattr(key, "char") and key.char:
-                                # If the key's char is a control unicode, convert it
-                                if self.is_ctrl_unicode(key.char):
-                                    char = self.character_from_ctrl_unicode(
-                                        self.get_unicode_order_from_char(key.char)
-                                    )
-                                    print(f"Control key pressed: {char}")
-                                    self.key_print.emit(char)
-
-                                    self.pressed_keys[key] = char
-                                    # print(f"Pressed Keys: {self.pressed_keys[key]}")
-                                    # You can now use `char` as the representation of the control key
-                                else:
-                                    if hasattr(key, "vk"):
-                                        if key.vk == 50 or key.vk == 54:
-                                            key_regular = chr(key.vk)
-                                        else:
-                                            key_regular = key.char.lower()
-                                    else:
-                                        key_regular = key.char.lower()
-                                    # print(f"Regular Key pressed: {key_regular}")
-                                    if not key_regular.isalnum():
-                                        key_regular = self.symbol_to_number.get(
-                                            key_regular, None
-                                        )
-                                        print("SYMBOL TO NUMBER: ", key_regular)
-                                    # print(f"Regular Value: {key.vk}")
-                                    print(f"Regular Key pressed: {key_regular}")
-
-                                    self.key_print.emit(key_regular)
-                                    if self.waiting_for_number_assignment:
-                                        try:
-                                            key_regular = int(key_regular)
-                                        except:
-                                            key_regular = 99
-                                        self.window_number_assignment.emit(key_regular)
-                                    else:
-                                        if key_regular == None:
-                                            key_regular = self.symbol_to_number.get(
-                                                str(key), None
-                                            )
-
-                                        self.pressed_keys[key] = key_regular
-                                    # print(f"Pressed Keys: {self.pressed_keys}")
-                            else:
-                                if hasattr(key, "vk"):
-                                    key_chr = chr(key.vk)
-                                    if key_chr in self.outcast_keys_map:
-                                        key_chr = self.outcast_keys_map[key_chr]
-                                    # key_value = key.value
-                                    # print(f"Key Value: {key_value}")
-                                    print(f"Key pressed (vk): {key_chr}")
-                                    self.key_print.emit(key_chr)
-                                    self.pressed_keys[key] = key_chr
-                                    # print(f"Pressed Keys: {self.pressed_keys}")
-                                else:
-                                    print(f"Special Key pressed: {key}")
-                                    special_key = format(key).split(".")[1]
-                                    self.key_print.emit(special_key)
-                                    self.pressed_keys[key] = special_key
-                                    # print(f"Pressed Keys: {self.pressed_keys}")
-                            # If we want this on pressed, but the problem is that the user might have both ctrl+shift+1 and ctrl+shift+1+up (which in this case hee can never reach the second one)
-                            # if detected_combo := self.detect_combinations():
-                            #     self.execute_action(detected_combo)
-
-                            print(f"Pressed Keys: {self.pressed_keys}")
-
-                        elif (
-                            isinstance(event, keyboard.Events.Release)
-                            and event.key in self.pressed_keys
-                        ):
-                            if self.pressed_since_released:
-                                if detected_combo := self.detect_combinations():
-                                    self.execute_action(detected_combo)
-                                else:
-                                    del self.pressed_keys[event.key]
-                                    self.pressed_since_released = False
-                            else:
-                                del self.pressed_keys[event.key]
-                                self.pressed_since_released = False
-
-                        elif (
-                            isinstance(event, keyboard.Events.Release)
-                            and event.key == keyboard.Key.esc
-                        ):
-                            print("Esc pressed. Exiting...")
-                            self.stop_listener()
-                            self.quit_requested.emit()
-                            break
-                    else:
-                        if (
-                            isinstance(event, keyboard.Events.Press)
-                            and not event.key == keyboard.Key.esc
-                        ):
-                            if event.key == keyboard.Key.enter:
-                                self.user_response.emit(True)
-                                self.pressed_keys = {}
-                                print("User response received.")
-                        elif (
-                            isinstance(event, keyboard.Events.Release)
-                            and event.key == keyboard.Key.esc
-                        ):
-                            print("Esc pressed. Exiting...")
-                            self.stop_listener()
-                            self.quit_requested.emit()
-                            break
+                    self.pressed_keys[key] = key_token
+                    logger.debug("Pressed Keys: %s", self.pressed_keys)
+                    self.resolve_chord_on_press()
+
+            elif not pressed and key in self.pressed_keys:
+                # Fires a chord that was still waiting on its timeout
+                if self.pressed_since_released:
+                    if detected_combo := self.detect_combinations():
+                        self.execute_action(detected_combo)
+                self.pressed_keys.pop(key, None)
+                self.fired_keys.discard(key)
+                self.pressed_since_released = False
+
+            elif not pressed and key in self.fired_keys:
+                self.fired_keys.discard(key)
+
+            elif not pressed and key == ESC_KEY:
+                logger.info("Esc pressed. Exiting...")
+                self.stop_listener()
+                self.quit_requested.emit()
+                return False
+        else:
+            if pressed and not key == ESC_KEY:
+                if key == ENTER_KEY:
+                    self.user_response.emit(True)
+                    self.pressed_keys = {}
+                    logger.debug("User response received.")
+            elif not pressed and key == ESC_KEY:
+                logger.info("Esc pressed. Exiting...")
+                self.stop_listener()
+                self.quit_requested.emit()
+                return False
+        return True
+
+    def resolve_chord_on_press(self):
+        signature = self.get_chord_signature(self.pressed_keys.values())
+        if signature not in self.shortcuts_index:
+            self.pending_chord_deadline = None
+        elif signature in self.ambiguous_chords:
+            # A longer chord may follow, so wait for it, the timeout or the release
+            self.pending_chord_deadline = self.key_event_time + self.chord_timeout
+        elif detected_combo := self.detect_combinations():
+            self.execute_action(detected_combo)
 
     def detect_combinations(self):
-        detected_combination = None
-        # print(f"Pressed Keys: {self.pressed_keys}")
-        for label, combination in self.user_shortcuts.items():
-            # Debug:
-            # print(f"Checking combination: {combination}")
-            # for key in combination:
-            #     print(type(key))
-
-            values = list(self.pressed_keys.values())
-            if combination == values:
-                # print(f"len combination: {len(combination)}, len pressed_keys: {len(self.pressed_keys)}")
-                print(f"Combination detected (Direct): {label}")
-                detected_combination = label
-                self.key_release_print.emit(
-                    f"Combination detected: {values} Action: {label}"
-                )
-                self.pressed_keys = {}
-                break
-        # Debug:
-        # print(f"Passed Keys: {self.pressed_keys.values()}")
-        # for value in self.pressed_keys.values():
-        #     print(type(value))
+        values = list(self.pressed_keys.values())
+        detected_combination = self.shortcuts_index.get(
+            self.get_chord_signature(values)
+        )
+        if detected_combination:
+            self.combo_detected_time = time.perf_counter()
+            logger.debug("Combination detected (Direct): %s", detected_combination)
+            self.key_release_print.emit(
+                f"Combination detected: {values} Action: {detected_combination}"
+            )
+            self.release_chord_triggers()
 
         return detected_combination
 
-    def execute_action(self, detected_combination):
+    def release_chord_triggers(self):
+        # The modifiers stay held, so another chord can follow without pressing them again
+        for key, token in list(self.pressed_keys.items()):
+            if token not in MODIFIER_KEYS:
+                del self.pressed_keys[key]
+                self.fired_keys.add(key)
+        self.pressed_since_released = False
+        self.pending_chord_deadline = None
 
-        match detected_combination:
-            case "configure window":
-                print("Configuring window...")
-                self.configure_window.emit()
-            case "toggle always on top":
-                self.window_action.emit(1, "toggle_on_top")
-            case "exit program":
-                self.close_app()
-            case "ctrl window 1":
-                self.window_action.emit(1, "ctrl")
-            case "open window 1":
-                self.window_action.emit(1, "open")
-            case "close window 1":
-                self.window_action.emit(1, "close")
-            case "close all windows 1":
-                self.window_action.emit(1, "close_all")
-            case "maximize window 1":
-                self.window_action.emit(1, "maximize")
-            case "minimize window 1":
-                self.window_action.emit(1, "minimize")
-
-            case "ctrl window 2":
-                self.window_action.emit(2, "ctrl")
-            case "open window 2":
-                self.window_action.emit(2, "open")
-            case "close window 2":
-                self.window_action.emit(2, "close")
-            case "close all windows 2":
-                self.window_action.emit(2, "close_all")
-            case "maximize window 2":
-                self.window_action.emit(2, "maximize")
-            case "minimize window 2":
-                self.window_action.emit(2, "minimize")
-
-            case "ctrl window 3":
-                self.window_action.emit(3, "ctrl")
-            case "open window 3":
-                self.window_action.emit(3, "open")
-            case "close window 3":
-                self.window_action.emit(3, "close")
-            case "close all windows 3":
-                self.window_action.emit(3, "close_all")
-            case "maximize window 3":
-                self.window_action.emit(3, "maximize")
-            case "minimize window 3":
-                self.window_action.emit(3, "minimize")
-
-            case "ctrl window 4":
-                self.window_action.emit(4, "ctrl")
-            case "open window 4":
-                self.window_action.emit(4, "open")
-            case "close window 4":
-                self.window_action.emit(4, "close")
-            case "close all windows 4":
-                self.window_action.emit(4, "close_all")
-            case "maximize window 4":
-                self.window_action.emit(4, "maximize")
-            case "minimize window 4":
-                self.window_action.emit(4, "minimize")
-
-            case "ctrl window 5":
-                self.window_action.emit(5, "ctrl")
-            case "open window 5":
-                self.window_action.emit(5, "open")
-            case "close window 5":
-                self.window_action.emit(5, "close")
-            case "close all windows 5":
-                self.window_action.emit(5, "close_all")
-            case "maximize window 5":
-                self.window_action.emit(5, "maximize")
-            case "minimize window 5":
-                self.window_action.emit(5, "minimize")
+    def execute_action(self, detected_combination):
+        action = self.actions_table.get(detected_combination)
+        if not action:
+            logger.debug("No action bound to: %s", detected_combination)
+            return
+
+        slot, action_name = action
+        if slot is not None:
+            if self.latency_tracker:
+                self.latency_tracker.begin(
+                    slot,
+                    action_name,
+                    key_event=self.key_event_time,
+                    combo_detected=self.combo_detected_time,
+                    action_emitted=time.perf_counter(),
+                )
+            self.window_action.emit(slot, action_name)
+        elif action_name == "configure_window":
+            logger.info("Configuring window...")
+            self.configure_window.emit()
+        elif action_name == "exit_program":
+            self.close_app()
+        elif action_name == "dump_latency_stats":
+            self.latency_dump_requested.emit()
+        elif action_name == "quick_switcher":
+            self.quick_switcher_requested.emit()
 
     def close_app(self):
-        print("Closing the app...")
+        logger.info("Closing the app...")
         self.stop_listener()
         self.quit_requested.emit()
 
     def open_window_1(self):
-        print("Opening window 1...")
+        logger.debug("Opening window 1...")
 
     def open_window_2(self):
-        print("Opening window 2...")
-
-    def is_ctrl_unicode(self, code: str) -> bool:
-        """Check if the given unicode character is a control character."""
-        return len(code) == 1 and 0 < ord(code) <= 26
-
-    def get_unicode_order_from_char(self, char: str) -> int:
-        """Get the unicode order (ordinal) of a character."""
-        if len(char) != 1:
-            return -1
-        return ord(char)
-
-    def character_from_ctrl_unicode(self, order: int) -> str:
-        """Get the corresponding character from a control unicode."""
-        if not 0 < order <= 26:  # Adjusted to include 26
-            return ""
-        pool = "abcdefghijklmnopqrstuvwxyz"
-        return pool[order - 1]
+        logger.debug("Opening window 2...")
 
 
 class MouseListener(QObject):
     mouse_finished = Signal()
     mouse_quit_requested = Signal()
     emit_mouse_moved = Signal(int, int)
-    emit_mouse_left_click = Signal()
+    emit_mouse_left_click = Signal(int, int)
 
     def __init__(self):
         super().__init__()
 
-        self.mouse_listen_pynput = False
         self.listen_mouse_pynput = True
-        self.can_mouse_run = True
         self.listen_to_mouse_clicks = False
+        # The InputHub feeding this listener
+        self.input_hub = None
+
+        # Moves are only delivered while someone subscribed to them (e.g. a guidance window).
+        # The latest position waits in a mailbox, and a signal is only emitted when it was empty,
+        # so the GUI gets at most one notification per drain however fast the mouse moves.
+        self.mouse_move_subscribers = 0
+        self.mouse_position_lock = threading.Lock()
+        self.latest_mouse_position = None
+        self.mouse_position_pending = False
+
+    def start_mouse_listener(self):
+        self.listen_mouse_pynput = True
 
-    def stop_mouse_listener(self, terminate=False):
-        self.mouse_listen_pynput = False
-        if terminate:
-            self.can_mouse_run = False
-
-    def on_mouse_events_pynput(self):
-        # The event listener will be running in this block
-        self.mouse_listen_pynput = True
-        with mouse.Events() as events:
-            # Block at most one second
-            while self.can_mouse_run:
-                if not self.listen_mouse_pynput:
-                    time.sleep(1)
-                else:
-                    event = events.get(1.0)
-                    if event is None:
-                        # print('You did not interact with the mouse within one second')
-                        continue
-                    else:
-                        # print('Received event {}'.format(event))
-                        if isinstance(event, mouse.Events.Move):
-                            self.emit_mouse_moved.emit(event.x, event.y)
-                        elif (
-                            isinstance(event, mouse.Events.Click)
-                            and self.listen_to_mouse_clicks
-                        ):
-                            # print(f"Mouse clicked: {event}")
-                            if event.button == mouse.Button.left and event.pressed:
-                                print("Left button clicked")
-                                self.emit_mouse_left_click.emit()
-                                # theoretically, we can also control self.mouse_listen_pynput here (if we wanna stop the listener)
+    def stop_mouse_listener(self):
+        self.listen_mouse_pynput = False
+        if self.input_hub:
+            self.input_hub.drop_events(MOUSE_DEVICE)
+
+    def subscribe_mouse_moves(self):
+        with self.mouse_position_lock:
+            self.mouse_move_subscribers += 1
+
+    def unsubscribe_mouse_moves(self):
+        with self.mouse_position_lock:
+            self.mouse_move_subscribers = max(0, self.mouse_move_subscribers - 1)
+            if not self.mouse_move_subscribers:
+                self.latest_mouse_position = None
+                self.mouse_position_pending = False
+
+    def take_mouse_position(self):
+        """Drain the mailbox, returns the latest (x, y) or None if the mouse didn't move."""
+        with self.mouse_position_lock:
+            position = self.latest_mouse_position
+            self.latest_mouse_position = None
+            self.mouse_position_pending = False
+        return position
+
+    def on_move(self, x, y, injected=False):
+        if not self.listen_mouse_pynput or not self.mouse_move_subscribers:
+            return
+        with self.mouse_position_lock:
+            self.latest_mouse_position = (x, y)
+            if self.mouse_position_pending:
+                return
+            self.mouse_position_pending = True
+        self.emit_mouse_moved.emit(x, y)
+
+    def process_click(self, x, y, button, pressed):
+        if self.listen_to_mouse_clicks:
+            if button == mouse.Button.left and pressed:
+                logger.debug("Left button clicked")
+                self.emit_mouse_left_click.emit(x, y)
+                # theoretically, we can also control self.listen_mouse_pynput here (if we wanna stop the listener)
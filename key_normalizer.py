@@ -0,0 +1,137 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+The key normalizer turns the keys pynput reports into the tokens used in preferences.ini.
+Every key is first reduced to a (vk, char, name) descriptor, which is then looked up in a table
+that is built once at startup. Only keys that are not in the table go through the slow path,
+and their result is added to the table so the next press is a single lookup as well.
+"""
+
+from pynput import keyboard
+
+# Descriptors of the keys the listener treats specially
+ESC_KEY = (None, None, "esc")
+ENTER_KEY = (None, None, "enter")
+
+# Keys that are reported by their vk only (e.g. while ctrl is held on Windows)
+OUTCAST_KEYS_MAP = {
+    "Þ": "'",
+    "Ü": "|",
+    "¿": "?",
+    "¾": ">",
+    "¼": "<",
+    "Ý": "}",
+    "Û": "{",
+    "º": ":",
+    "»": "+",
+}
+SYMBOL_TO_NUMBER = {
+    "!": "1",  # Shift+1 is !
+    "@": "2",  # Shift+2 is @
+    "#": "3",  # Shift+3 is #
+    "$": "4",  # Shift+4 is $
+    "%": "5",  # Shift+5 is %
+    "^": "6",  # Shift+6 is ^
+    "&": "7",  # Shift+7 is &
+    "*": "8",  # Shift+8 is *
+    "(": "9",  # Shift+9 is (
+    ")": "0",  # Shift+0 is )
+    "<": ",",  # Shift+, is <
+    ">": ".",  # Shift+. is >
+    "?": "/",  # Shift+/ is ?
+    ":": ";",  # Shift+; is :
+    '"': "'",  # Shift+' is "
+    "{": "[",  # Shift+[ is {
+    "}": "]",  # Shift+] is }
+    "|": "\\",  # Shift+\ is |
+    "_": "-",  # Shift+- is _
+    "+": "=",  # Shift+= is +
+    "~": "`",  # Shift+` is ~
+    r"'\x1f'": "-",
+}
+# With shift held these vks report a symbol, but the binding uses the digit
+DIGIT_VKS = (50, 54)
+
+_MISSING = object()
+
+
+class KeyNormalizer:
+    def __init__(self):
+        self.table = {}
+        self.build_table()
+
+    def build_table(self):
+        # Special keys (shift, ctrl_l, enter...) are named after their Key member
+        for key in keyboard.Key:
+            self.table[(None, None, key.name)] = key.name
+
+        # Keys without a char, mapped from their vk
+        for vk in range(256):
+            self.table[(vk, None, None)] = self.normalize_slow(vk, None, None)
+
+        # Characters, including the control characters sent while ctrl is held
+        chars = [chr(order) for order in range(1, 27)]
+        chars += [chr(order) for order in range(32, 127)]
+        for char in chars:
+            self.table[(None, char, None)] = self.normalize_slow(None, char, None)
+
+        # Windows reports letters and digits with both their vk and char
+        for vk in list(range(48, 58)) + list(range(65, 91)):
+            for char in {chr(vk), chr(vk).lower()}:
+                self.table[(vk, char, None)] = self.normalize_slow(vk, char, None)
+
+    def describe(self, key):
+        """Reduce a pynput Key or KeyCode to a hashable (vk, char, name) descriptor."""
+        name = getattr(key, "name", None)
+        if name is not None:
+            return (None, None, name)
+        return (key.vk, key.char, None)
+
+    def normalize(self, descriptor):
+        token = self.table.get(descriptor, _MISSING)
+        if token is _MISSING:
+            token = self.normalize_slow(*descriptor)
+            self.table[descriptor] = token
+        return token
+
+    def normalize_slow(self, vk, char, name):
+        if name is not None:
+            return name
+
+        if char:
+            # If the key's char is a control unicode, convert it
+            if self.is_ctrl_unicode(char):
+                return self.character_from_ctrl_unicode(
+                    self.get_unicode_order_from_char(char)
+                )
+
+            if vk in DIGIT_VKS:
+                token = chr(vk)
+            else:
+                token = char.lower()
+            if not token.isalnum():
+                # Fall back to the printed form of the key (e.g. '\x1f' for ctrl+shift+-)
+                token = SYMBOL_TO_NUMBER.get(token, SYMBOL_TO_NUMBER.get(repr(char)))
+            return token
+
+        if vk is not None:
+            token = chr(vk)
+            return OUTCAST_KEYS_MAP.get(token, token)
+
+        return None
+
+    def is_ctrl_unicode(self, code: str) -> bool:
+        """Check if the given unicode character is a control character."""
+        return len(code) == 1 and 0 < ord(code) <= 26
+
+    def get_unicode_order_from_char(self, char: str) -> int:
+        """Get the unicode order (ordinal) of a character."""
+        if len(char) != 1:
+            return -1
+        return ord(char)
+
+    def character_from_ctrl_unicode(self, order: int) -> str:
+        """Get the corresponding character from a control unicode."""
+        if not 0 < order <= 26:  # Adjusted to include 26
+            return ""
+        pool = "abcdefghijklmnopqrstuvwxyz"
+        return pool[order - 1]
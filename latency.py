@@ -0,0 +1,122 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+The latency tracker measures how long a hotkey takes, from the moment pynput delivers the key event
+until the window detector is done with the window.
+Every stage on the way is timestamped, and the time spent between stages is collected into
+per-action histograms that can be dumped on demand (p50/p95/p99).
+"""
+
+import math
+import threading
+import time
+
+# Stage timestamps, in the order a hotkey goes through them
+STAGES = (
+    "key_event",  # pynput delivered the key event to the listener
+    "combo_detected",  # detect_combinations resolved the chord
+    "action_emitted",  # window_action was emitted to the main window
+    "control_started",  # MainWindow.control_window started handling it
+    "detector_returned",  # The WindowDetector call returned
+)
+# The span between two stages, reported as its own histogram
+SPANS = {
+    "listener": ("key_event", "combo_detected"),
+    "dispatch": ("combo_detected", "action_emitted"),
+    "qt_queue": ("action_emitted", "control_started"),
+    "detector": ("control_started", "detector_returned"),
+    "total": ("key_event", "detector_returned"),
+}
+
+
+class LatencyHistogram:
+    """Log-scaled buckets, so recording is O(1) and percentiles are read from the counts."""
+
+    def __init__(self, min_value=1e-5, growth=2**0.25, buckets=96):
+        self.min_value = min_value
+        self.log_growth = math.log(growth)
+        self.growth = growth
+        self.counts = [0] * buckets
+        self.count = 0
+        self.max_value = 0.0
+
+    def record(self, seconds):
+        if seconds <= self.min_value:
+            index = 0
+        else:
+            index = int(math.log(seconds / self.min_value) / self.log_growth)
+            index = min(index, len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.max_value = max(self.max_value, seconds)
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the given fraction of the samples."""
+        if not self.count:
+            return 0.0
+        target = math.ceil(self.count * fraction)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                upper_bound = self.min_value * self.growth ** (index + 1)
+                return min(upper_bound, self.max_value)
+        return self.max_value
+
+
+class LatencyTracker:
+    def __init__(self):
+        # The listener, the GUI thread and the detector all report here
+        self.lock = threading.Lock()
+        # (slot, action) -> stage timestamps of the hotkey currently in flight
+        self.pending = {}
+        # (action, span) -> LatencyHistogram
+        self.histograms = {}
+
+    def begin(self, slot, action, **stamps):
+        """Start tracing a hotkey, stamps are stage names mapped to perf_counter() values."""
+        with self.lock:
+            self.pending[(slot, action)] = dict(stamps)
+
+    def mark(self, slot, action, stage, timestamp=None):
+        with self.lock:
+            if trace := self.pending.get((slot, action)):
+                trace[stage] = timestamp or time.perf_counter()
+
+    def finish(self, slot, action, timestamp=None):
+        """Stamp the detector stage and fold the trace into the histograms."""
+        timestamp = timestamp or time.perf_counter()
+        with self.lock:
+            trace = self.pending.pop((slot, action), None)
+            if not trace:
+                return
+            trace["detector_returned"] = timestamp
+            for span, (start, end) in SPANS.items():
+                if start in trace and end in trace:
+                    histogram = self.histograms.get((action, span))
+                    if not histogram:
+                        histogram = self.histograms[(action, span)] = LatencyHistogram()
+                    histogram.record(trace[end] - trace[start])
+
+    def report(self):
+        with self.lock:
+            if not self.histograms:
+                return "No hotkey latency recorded yet."
+            lines = ["Hotkey latency (ms):"]
+            span_order = list(SPANS)
+            for (action, span), histogram in sorted(
+                self.histograms.items(),
+                key=lambda item: (item[0][0], span_order.index(item[0][1])),
+            ):
+                lines.append(
+                    f"{action:<16} {span:<10} n={histogram.count:<6}"
+                    f" p50={histogram.percentile(0.50) * 1000:.2f}"
+                    f" p95={histogram.percentile(0.95) * 1000:.2f}"
+                    f" p99={histogram.percentile(0.99) * 1000:.2f}"
+                    f" max={histogram.max_value * 1000:.2f}"
+                )
+            return "\n".join(lines)
+
+    def reset(self):
+        with self.lock:
+            self.pending = {}
+            self.histograms = {}
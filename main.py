@@ -1,19 +1,22 @@
 """
 ~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
 In this main.py file, we have the main window of the application.
-Using Qt for the GUI, and its threading capabilities to run the keyboard and mouse listeners in separate threads.
+Using Qt for the GUI, and its threading capabilities to run the keyboard and mouse listeners in a shared input thread.
 All the modules are imported and the necessary classes are created.
 There's also a Transparent (glass-like) window that shows instructions to the user.
 It follows the cursor and guides the user on the configuration process.
+The quick switcher reuses that window's look to search the open windows by title as you type.
 """
 
 from PySide6.QtCore import (
+    QEvent,
     QSize,
     Qt,
     QThread,
     QTimer,
     QPoint,
     QPropertyAnimation,
+    Signal,
 )
 from PySide6.QtGui import (
     QIcon,
@@ -40,18 +43,36 @@ from PySide6.QtWidgets import (
     QLabel,
     QGraphicsDropShadowEffect,
     QGraphicsOpacityEffect,
+    QLineEdit,
+    QListWidget,
 )
+import argparse
 import sys
 import os
 import logging
 
 # My imports
-from input_listener import KeyboardListener, MouseListener
+from input_listener import InputHub, KeyboardListener, MouseListener
 from config import UserConfig
-from window_detector import WindowDetector
+from window_detector import WindowDetector, BATCH_DONE
+from window_index import TitleIndex
+from command_queue import PRIORITY_BACKGROUND, DetectorCommandQueue
+from workspace import (
+    capture_workspace,
+    restore_workspace,
+    save_workspace,
+    load_workspace,
+)
+from latency import LatencyTracker
+from replay import KeyEventRecorder
+from app_logging import setup_logging, set_log_level, get_log_level, stop_logging
+
+logger = logging.getLogger(__name__)
 
 
 class GuidanceWindow(QLabel):
+    closed = Signal()
+
     def __init__(
         self,
         text1="",
@@ -70,6 +91,7 @@ class GuidanceWindow(QLabel):
         self.text2 = text2  # Usually the window name
         self.text3 = text3  # Instruction 2
         self.custom_font = font
+        self.is_closed = False
         self.initUI()
         self.initFadeInEffect()
 
@@ -105,6 +127,13 @@ class GuidanceWindow(QLabel):
         self.fadeOutAnimation.finished.connect(self.close)
         self.fadeOutAnimation.start()
 
+    def closeEvent(self, event):
+        # closeWindow can run more than once, but closed is only emitted the first time
+        if not self.is_closed:
+            self.is_closed = True
+            self.closed.emit()
+        super().closeEvent(event)
+
     def setText(self, text):
         self.text = text
         self.update()
@@ -143,105 +172,191 @@ class GuidanceWindow(QLabel):
         painter.fillPath(path, QColor("white"))
 
 
+class QuickSwitcher(GuidanceWindow):
+    # The window object of the picked result
+    window_selected = Signal(object)
+
+    def __init__(self, title_index, coordinates=(0, 0), font="arial"):
+        self.title_index = title_index
+        self.results = []  # (handle, title, window) shown in the list
+        self.closed_by_escape = False
+        super().__init__(
+            text1="Switch to window:", fade_in=150, coordinates=coordinates, font=font
+        )
+
+    def initUI(self):
+        super().initUI()
+        self.setFixedSize(750, 420)
+
+        self.search_input = QLineEdit(self)
+        self.search_input.setFont(self.custom_font)
+        # A new query starts from its best result
+        self.search_input.textChanged.connect(lambda: self.update_results())
+        self.search_input.returnPressed.connect(self.select_current)
+        self.results_list = QListWidget(self)
+        self.results_list.setFont(self.custom_font)
+        self.results_list.itemActivated.connect(self.select_current)
+
+        layout = QVBoxLayout(self)
+        # Leaves room for the instruction painted above
+        layout.setContentsMargins(20, 55, 20, 20)
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.results_list)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Overlays don't get the focus by themselves
+        self.activateWindow()
+        self.search_input.setFocus()
+
+    def update_results(self, keep_selection=False):
+        """Search again, keep_selection keeps the selected window selected (for the refreshes)."""
+        results = self.title_index.search(self.search_input.text())
+        listed = [(handle, title) for handle, title, _ in results]
+        if listed == [(handle, title) for handle, title, _ in self.results]:
+            # Same list, only the window objects may be newer
+            self.results = results
+            return
+
+        row = self.results_list.currentRow()
+        selected_handle = None
+        if keep_selection and 0 <= row < len(self.results):
+            selected_handle = self.results[row][0]
+        self.results = results
+        self.results_list.clear()
+        self.results_list.addItems([title for _, title in listed])
+        if self.results:
+            handles = [handle for handle, _ in listed]
+            self.results_list.setCurrentRow(
+                handles.index(selected_handle) if selected_handle in handles else 0
+            )
+
+    def select_current(self):
+        row = self.results_list.currentRow()
+        if 0 <= row < len(self.results):
+            self.window_selected.emit(self.results[row][2])
+            self.close()
+
+    def changeEvent(self, event):
+        # Clicking away closes it, like a popup
+        if event.type() == QEvent.ActivationChange and not self.isActiveWindow():
+            self.close()
+        super().changeEvent(event)
+
+    def keyPressEvent(self, event):
+        # The search input leaves these keys to us
+        if event.key() == Qt.Key_Escape:
+            self.closed_by_escape = True
+            self.close()
+        elif event.key() in (Qt.Key_Up, Qt.Key_Down):
+            step = -1 if event.key() == Qt.Key_Up else 1
+            row = self.results_list.currentRow() + step
+            if 0 <= row < self.results_list.count():
+                self.results_list.setCurrentRow(row)
+        else:
+            super().keyPressEvent(event)
+
+
 class MainWindow(QMainWindow):
-    def __init__(self, app):
+    def __init__(self, app, record_path=None):
         super().__init__()
         self.app = app  # Store the app instance
         self.app.setStyle("Fusion")
         self.setWindowTitle("XYZ Manager")
         self.setGeometry(800, 800, 800, 600)
-        logging.basicConfig(level=logging.DEBUG)  # Set up basic logging
         self.setWindowFlag(Qt.WindowStaysOnTopHint)  # Make the window always on top
         self.custom_font = self.get_custom_font(size=16)
         self.custom_font_main_ui = self.get_custom_font(size=12)
         self.app.setFont(self.custom_font_main_ui)
         # Guidance Window
         self.guidanceWindow = None
+        # Quick switcher, searching the window titles indexed here
+        self.quick_switcher = None
+        self.title_index = TitleIndex()
+        self.title_refresh_timer = QTimer(self)
+        self.title_refresh_timer.setInterval(1000)
+        self.title_refresh_timer.timeout.connect(self.refresh_title_index)
+
+        # Key updates from the listener are batched and flushed once per display frame
+        refresh_rate = self.app.primaryScreen().refreshRate() or 60
+        self.frame_interval = max(1, round(1000 / refresh_rate))
+        self.pending_status_key = None  # Latest value wins
+        self.pending_terminal_lines = []
+        self.gui_flush_timer = QTimer(self)
+        self.gui_flush_timer.setSingleShot(True)
+        self.gui_flush_timer.timeout.connect(self.flush_gui_updates)
+        self.mouse_frame_timer = QTimer(self)
+        self.mouse_frame_timer.setSingleShot(True)
+        self.mouse_frame_timer.timeout.connect(self.drain_mouse_position)
 
         self.user_config = UserConfig()
         if config_file := self.user_config.GOD["preferences.ini"]["file"]:
-            print("Config File Found")
-            print(f"Config Path: {self.user_config.GOD['config.ini']['path']}")
+            logger.info("Config File Found")
+            logger.info("Config Path: %s", self.user_config.GOD["config.ini"]["path"])
         else:
             sys.exit("Config file could not be created. Exiting...")
 
         self.last_active_window = None
+        # slot -> hotkey action, for the slots waiting for their window to open
+        self.opening_slots = {}
         self.can_control_windows = False
-        self.all_windows = [
-            {
-                "window_object": None,
-                "window_title": None,
-                "exe_path": None,
-                "window_handle": None,
-            },
-            {
-                "window_object": None,
-                "window_title": None,
-                "exe_path": None,
-                "window_handle": None,
-            },
-            {
-                "window_object": None,
-                "window_title": None,
-                "exe_path": None,
-                "window_handle": None,
-            },
-            {
-                "window_object": None,
-                "window_title": None,
-                "exe_path": None,
-                "window_handle": None,
-            },
-            {
-                "window_object": None,
-                "window_title": None,
-                "exe_path": None,
-                "window_handle": None,
-            },
-            {
-                "window_object": None,
-                "window_title": None,
-                "exe_path": None,
-                "window_handle": None,
-            },
-        ]
+        # One slot per number key (0-9), more are added on demand by ensure_window_slot
+        self.all_windows = [self.create_window_slot() for _ in range(10)]
         self.mouse_left_clicks_counter = 0
         self.selected_window = None
 
-        self.keyboard_pynput_thread = QThread()
-        self.mouse_pynput_thread = QThread()
+        self.input_hub_thread = QThread()
         self.window_detector_thread = QThread()
 
-        self.keyboard_pynput_worker = KeyboardListener(config_file)
+        # Hotkey latency, from the key event until the window detector returns
+        self.latency_tracker = LatencyTracker()
+
+        self.keyboard_pynput_worker = KeyboardListener(
+            config_file, latency_tracker=self.latency_tracker
+        )
+        if record_path:
+            logger.info("Recording key events to %s", record_path)
+            self.keyboard_pynput_worker.key_recorder = KeyEventRecorder(record_path)
         self.mouse_pynput_worker = MouseListener()
+        # One thread listens to both devices and feeds their events to the two workers in order
+        self.input_hub = InputHub(self.keyboard_pynput_worker, self.mouse_pynput_worker)
         self.window_detector_worker = WindowDetector()
 
-        self.mouse_pynput_worker.moveToThread(self.mouse_pynput_thread)
-        self.keyboard_pynput_worker.moveToThread(self.keyboard_pynput_thread)
+        self.input_hub.moveToThread(self.input_hub_thread)
+        self.mouse_pynput_worker.moveToThread(self.input_hub_thread)
+        self.keyboard_pynput_worker.moveToThread(self.input_hub_thread)
         self.window_detector_worker.moveToThread(self.window_detector_thread)
+        # Every detector call goes through here, so it runs on the detector thread
+        self.detector_commands = DetectorCommandQueue(self.window_detector_thread)
 
-        self.keyboard_pynput_thread.started.connect(
-            self.keyboard_pynput_worker.on_keyboard_events_pynput
-        )
-        self.mouse_pynput_thread.started.connect(
-            self.mouse_pynput_worker.on_mouse_events_pynput
-        )
+        self.input_hub_thread.started.connect(self.input_hub.run)
 
         self.keyboard_pynput_worker.quit_requested.connect(self.quit_app)
         self.keyboard_pynput_worker.key_print.connect(self.print_key)
         self.keyboard_pynput_worker.key_release_print.connect(self.print_release_key)
         self.keyboard_pynput_worker.configure_window.connect(self.configure_window)
         self.keyboard_pynput_worker.window_action.connect(self.control_window)
+        self.window_detector_worker.window_opened.connect(self.on_window_opened)
         self.keyboard_pynput_worker.window_number_assignment.connect(
             self.configure_window
         )
+        self.keyboard_pynput_worker.latency_dump_requested.connect(
+            self.dump_latency_stats
+        )
+        self.keyboard_pynput_worker.quick_switcher_requested.connect(
+            self.open_quick_switcher
+        )
 
         self.mouse_pynput_worker.emit_mouse_moved.connect(self.on_mouse_move)
-        self.mouse_pynput_worker.emit_mouse_left_click.connect(self.get_active_window)
+        self.mouse_pynput_worker.emit_mouse_left_click.connect(self.on_mouse_left_click)
 
-        self.keyboard_pynput_thread.start()
-        self.mouse_pynput_thread.start()
+        self.input_hub_thread.start()
         self.window_detector_thread.start()
+        # The recent windows follow the focus from here on
+        self.detector_commands.submit(
+            self.window_detector_worker.start_focus_tracking,
+            priority=PRIORITY_BACKGROUND,
+        )
 
         # Save path cross-platform
         icon_path = os.path.join(os.path.dirname(__file__), "images/app_icon.ico")
@@ -283,6 +398,18 @@ class MainWindow(QMainWindow):
             )
         )
 
+        # Debug Logging Action (level can be switched while running)
+        debug_logging_action = file_menu.addAction("Debug Logging")
+        debug_logging_action.setCheckable(True)
+        debug_logging_action.setChecked(get_log_level() <= logging.DEBUG)
+        debug_logging_action.toggled.connect(
+            lambda checked: set_log_level(logging.DEBUG if checked else logging.INFO)
+        )
+
+        # Latency Stats Action
+        latency_action = file_menu.addAction("Latency Stats")
+        latency_action.triggered.connect(self.dump_latency_stats)
+
         # Toolbars
         toolbar = QToolBar("Main Toolbar")
         # toolbar.setStyleSheet("background-color: #A5B4FC; color: black;")
@@ -376,6 +503,10 @@ class MainWindow(QMainWindow):
                 self.debug_terminal.append(f"Assignment Index: {assignment_index}")
 
         if configure_stage == 0:
+            # Queued ahead of the click lookups, which run after it in order
+            self.detector_commands.submit(
+                self.window_detector_worker.refresh_window_index
+            )
             self.mouse_pynput_worker.listen_to_mouse_clicks = True
             self.create_guidance_window(
                 window_text2="Press on the window you want to configure"
@@ -407,32 +538,63 @@ class MainWindow(QMainWindow):
                 window_fade_out=250,
                 show_and_destroy=True,
             )
-            self.all_windows[assignment_index]["window_object"] = self.selected_window
+            self.set_slot_window(assignment_index, self.selected_window)
             self.all_windows[assignment_index][
                 "window_title"
             ] = self.selected_window.title
-            self.all_windows[assignment_index][
-                "window_handle"
-            ] = self.selected_window.getHandle()
-            self.all_windows[assignment_index]["exe_path"] = (
-                self.window_detector_worker.get_exe_path_from_window_handle(
-                    self.all_windows[assignment_index]["window_handle"]
-                )
+            self.all_windows[assignment_index]["exe_path"] = None
+            self.detector_commands.submit(
+                self.window_detector_worker.get_exe_path_from_window_handle,
+                self.all_windows[assignment_index]["window_handle"],
+                on_done=lambda future: self.on_exe_path_found(assignment_index, future),
             )
 
             # Clean-up:
             self.selected_window = None
             self.keyboard_pynput_worker.waiting_for_number_assignment = False
             self.mouse_pynput_worker.listen_to_mouse_clicks = False
-            # Print exe path
-            print(f"Exe Path: {self.all_windows[assignment_index]['exe_path']}")
+
+    def on_exe_path_found(self, window_index, future):
+        if future.exception():
+            return
+        self.all_windows[window_index]["exe_path"] = future.result()
+        # Print exe path
+        logger.debug("Exe Path: %s", self.all_windows[window_index]["exe_path"])
+
+    def on_mouse_left_click(self, x, y):
+        # Resolve the click to the window under it, instead of racing the focus change
+        self.detector_commands.submit(
+            self.window_detector_worker.get_window_at,
+            x,
+            y,
+            on_done=self.on_clicked_window_found,
+        )
+
+    def on_clicked_window_found(self, future):
+        if not self.mouse_pynput_worker.listen_to_mouse_clicks:
+            # The configuration ended while the click was being resolved
+            return
+        if not future.exception() and (window := future.result()):
+            self.selected_window = window
+            self.debug_terminal.append(f"Selected Window: {window.title}")
+            self.debug_terminal.append(f"Selected Window Handle: {window.getHandle()}")
+            self.configure_window(configure_stage=1)
+        else:
+            self.get_active_window()
 
     def get_active_window(self, direct_assign_window=False, assignment_index=None):
         self.debug_terminal.append("Get Active Window Reached")
+        self.detector_commands.submit(
+            self.window_detector_worker.get_active_window_simple,
+            on_done=lambda future: self.on_active_window_found(
+                future, direct_assign_window, assignment_index
+            ),
+        )
+
+    def on_active_window_found(self, future, direct_assign_window, assignment_index):
+        active_window = None if future.exception() else future.result()
         if not direct_assign_window:
-            self.selected_window = (
-                self.window_detector_worker.get_active_window_simple()
-            )
+            self.selected_window = active_window
             if self.selected_window:
                 self.debug_terminal.append(
                     f"Selected Window: {self.selected_window.title}"
@@ -445,106 +607,166 @@ class MainWindow(QMainWindow):
             else:
                 self.configure_window(configure_stage=2)
         else:
-            self.all_windows[assignment_index][
-                "window_object"
-            ] = self.window_detector_worker.get_active_window_simple()
+            self.set_slot_window(assignment_index, active_window)
+
+    def create_window_slot(self):
+        return {
+            "window_object": None,
+            "window_title": None,
+            "exe_path": None,
+            "window_handle": None,
+        }
+
+    def ensure_window_slot(self, window_index):
+        # Shortcuts can bind any slot number, so grow the slots list to fit it
+        while len(self.all_windows) <= window_index:
+            self.all_windows.append(self.create_window_slot())
 
     def control_window(self, window_index, action):
-        print("Control Window Reached")
-        print(f"Window Index: {window_index}")
-        print(f"Action: {action}")
+        self.latency_tracker.mark(window_index, action, "control_started")
+        logger.debug(
+            "Control Window Reached: index %s, action %s", window_index, action
+        )
+        # The workspace number takes the slot's place, so these leave the slots alone
+        if action in ("save_workspace", "restore_workspace"):
+            self.control_workspace(window_index, action)
+            return
+        # The slot number is how many focus switches to go back
+        if action == "switch_recent":
+            self.open_last_active_window(window_index)
+            return
+        self.ensure_window_slot(window_index)
+        detector = self.window_detector_worker
+        slot = self.all_windows[window_index]
+        # A window that was closed since it was assigned is dropped, the exe can open it again
+        if slot["window_object"] and not detector.state_mirror.is_alive(
+            slot["window_object"]
+        ):
+            logger.debug("Window of slot %s was closed", window_index)
+            self.detector_commands.submit(
+                detector.state_mirror.unwatch, slot["window_object"]
+            )
+            slot["window_object"] = None
+            slot["window_handle"] = None
         # Toggle the control of windows
         match action:
             case "ctrl":
-                if self.all_windows[window_index]["window_object"]:
-                    self.window_detector_worker.ctrl_window(
-                        self.all_windows[window_index]["window_object"]
-                    )
-                elif self.all_windows[window_index]["exe_path"]:
-                    self.all_windows[window_index]["window_object"] = (
-                        self.window_detector_worker.open_window(
-                            self.all_windows[window_index]["exe_path"],
-                            self.all_windows[window_index]["window_title"],
-                        )
+                if slot["window_object"]:
+                    self.submit_window_command(
+                        window_index,
+                        action,
+                        detector.ctrl_window,
+                        slot["window_object"],
                     )
+                    return
+                elif slot["exe_path"]:
+                    self.open_window_in_slot(window_index, action)
+                    return
                 else:
                     self.debug_terminal.append("CTRL:")
                     self.debug_terminal.append(
                         "No window found for this index, please configure it first <3"
                     )
             case "open":
-                if self.all_windows[window_index]["exe_path"]:
-                    self.all_windows[window_index]["window_object"] = (
-                        self.window_detector_worker.open_window(
-                            self.all_windows[window_index]["exe_path"],
-                            self.all_windows[window_index]["window_title"],
-                        )
-                    )
-                elif self.all_windows[window_index]["window_object"]:
-                    self.all_windows[window_index]["exe_path"] = (
-                        self.window_detector_worker.get_exe_path_from_window_handle(
-                            self.all_windows[window_index]["window_handle"]
-                        )
+                if slot["exe_path"]:
+                    self.open_window_in_slot(window_index, action)
+                    return
+                elif slot["window_object"]:
+                    self.submit_window_command(
+                        window_index,
+                        action,
+                        detector.get_exe_path_from_window_handle,
+                        slot["window_handle"],
+                        on_done=lambda exe_path: self.open_found_exe_in_slot(
+                            window_index, action, exe_path
+                        ),
+                        finish_latency=False,
                     )
-                    if self.all_windows[window_index]["exe_path"]:
-                        self.all_windows[window_index]["window_object"] = (
-                            self.window_detector_worker.open_window(
-                                self.all_windows[window_index]["exe_path"],
-                                self.all_windows[window_index]["window_title"],
-                            )
-                        )
+                    return
                 else:
                     # Clear all properties for this index window
-                    self.all_windows[window_index]["window_object"] = None
-                    self.all_windows[window_index]["window_handle"] = None
-                    self.all_windows[window_index]["exe_path"] = None
-                    self.all_windows[window_index]["window_title"] = None
+                    slot["window_object"] = None
+                    slot["window_handle"] = None
+                    slot["exe_path"] = None
+                    slot["window_title"] = None
 
                     self.debug_terminal.append("OPEN:")
                     self.debug_terminal.append(
                         "No window found for this index, please configure it first <3"
                     )
             case "close":
-                if self.all_windows[window_index]["window_object"]:
-                    self.window_detector_worker.close_window(
-                        self.all_windows[window_index]["window_object"]
+                if slot["window_object"]:
+                    self.submit_window_command(
+                        window_index,
+                        action,
+                        detector.close_window,
+                        slot["window_object"],
                     )
-                    self.all_windows[window_index]["window_object"] = None
-                    self.all_windows[window_index]["window_handle"] = None
+                    slot["window_object"] = None
+                    slot["window_handle"] = None
+                    return
             case "close_all":
-                if self.all_windows[window_index]["window_title"]:
-                    self.window_detector_worker.close_all_windows(
-                        self.all_windows[window_index]["window_title"]
+                if slot["window_title"]:
+                    self.submit_window_command(
+                        window_index,
+                        action,
+                        detector.close_all_windows,
+                        slot["window_title"],
+                        on_done=lambda results: self.report_batch(action, results),
                     )
-                    self.all_windows[window_index]["window_object"] = None
-                    self.all_windows[window_index]["window_handle"] = None
+                    slot["window_object"] = None
+                    slot["window_handle"] = None
+                    return
                 else:
                     self.debug_terminal.append("CLOSE-ALL:")
                     self.debug_terminal.append(
                         "No window title found for this index, please configure it first <3"
                     )
             case "maximize":
-                if self.all_windows[window_index]["window_object"]:
-                    self.window_detector_worker.maximize_window(
-                        self.all_windows[window_index]["window_object"]
+                if slot["window_object"]:
+                    self.submit_window_command(
+                        window_index,
+                        action,
+                        detector.maximize_window,
+                        slot["window_object"],
                     )
                     self.debug_terminal.append("Maximize Window")
+                    return
                 else:
                     self.debug_terminal.append("MAXIMIZE:")
                     self.debug_terminal.append(
                         "No window found for this index, please configure it first <3"
                     )
             case "minimize":
-                if self.all_windows[window_index]["window_object"]:
-                    self.window_detector_worker.minimize_window(
-                        self.all_windows[window_index]["window_object"]
+                if slot["window_object"]:
+                    self.submit_window_command(
+                        window_index,
+                        action,
+                        detector.minimize_window,
+                        slot["window_object"],
                     )
                     self.debug_terminal.append("Minimize Window")
+                    return
                 else:
                     self.debug_terminal.append("MINIMIZE:")
                     self.debug_terminal.append(
                         "No window found for this index, please configure it first <3"
                     )
+            case "minimize_others":
+                if slot["window_object"]:
+                    self.submit_window_command(
+                        window_index,
+                        action,
+                        detector.minimize_other_windows,
+                        slot["window_object"],
+                        on_done=lambda results: self.report_batch(action, results),
+                    )
+                    return
+                else:
+                    self.debug_terminal.append("MINIMIZE-OTHERS:")
+                    self.debug_terminal.append(
+                        "No window found for this index, please configure it first <3"
+                    )
             case "toggle_on_top":
                 # Check if the window is already on top
                 if self.windowFlags() & Qt.WindowStaysOnTopHint:
@@ -557,13 +779,167 @@ class MainWindow(QMainWindow):
                 # Reapply the widget/window settings for changes to take effect
                 self.show()
 
+        # Nothing was sent to the detector
+        self.latency_tracker.finish(window_index, action)
+
+    def control_workspace(self, number, action):
+        detector = self.window_detector_worker
+        if action == "save_workspace":
+            self.submit_window_command(
+                number,
+                action,
+                capture_workspace,
+                detector,
+                self.copy_window_slots(),
+                on_done=lambda snapshot: self.save_workspace(number, snapshot),
+            )
+        elif snapshot := load_workspace(self.user_config, number):
+            self.submit_window_command(
+                number,
+                action,
+                restore_workspace,
+                detector,
+                snapshot,
+                self.copy_window_slots(),
+                on_done=lambda report: self.report_workspace_restore(number, report),
+            )
+        else:
+            self.debug_terminal.append(
+                f"Workspace {number} wasn't saved yet, save it first <3"
+            )
+            # Nothing was sent to the detector
+            self.latency_tracker.finish(number, action)
+
+    def submit_window_command(
+        self,
+        window_index,
+        action,
+        function,
+        *args,
+        on_done=None,
+        finish_latency=True,
+        **kwargs,
+    ):
+        """
+        Run a detector call for a hotkey on the detector thread.
+        The hotkey's latency is finished once the call returns, then on_done gets its result.
+        """
+
+        def command_done(future):
+            if finish_latency or future.exception():
+                self.latency_tracker.finish(window_index, action)
+            if future.exception():
+                self.debug_terminal.append(f"{action}: {future.exception()}")
+                return
+            if on_done:
+                on_done(future.result())
+
+        return self.detector_commands.submit(
+            function, *args, on_done=command_done, **kwargs
+        )
+
+    def copy_window_slots(self):
+        # The detector thread gets its own copy, the slots are only changed on the GUI thread
+        return [dict(window_slot) for window_slot in self.all_windows]
+
+    def save_workspace(self, number, snapshot):
+        save_workspace(self.user_config, number, snapshot)
+        self.debug_terminal.append(
+            f"Workspace {number} saved with {len(snapshot)} windows"
+        )
+
+    def report_workspace_restore(self, number, report):
+        self.debug_terminal.append(f"Workspace {number} restored:")
+        for slot, outcome in sorted(report.items()):
+            self.debug_terminal.append(f"  Slot {slot}: {outcome}")
+
+    def report_batch(self, action, results):
+        failed = {
+            handle: result for handle, result in results.items() if result != BATCH_DONE
+        }
+        self.debug_terminal.append(
+            f"{action}: {len(results) - len(failed)}/{len(results)} windows done"
+        )
+        for handle, result in failed.items():
+            self.debug_terminal.append(f"  Window {handle}: {result}")
+
+    def open_window_in_slot(self, window_index, action="open"):
+        # The detector waits for the window on its own thread, on_window_opened fills the slot
+        # and finishes the hotkey's latency once the window shows up
+        self.opening_slots[window_index] = action
+        self.submit_window_command(
+            window_index,
+            action,
+            self.window_detector_worker.open_window_async,
+            self.all_windows[window_index]["exe_path"],
+            self.all_windows[window_index]["window_title"],
+            context={"slot": window_index},
+            finish_latency=False,
+        )
+
+    def open_found_exe_in_slot(self, window_index, action, exe_path):
+        self.all_windows[window_index]["exe_path"] = exe_path
+        if exe_path:
+            self.open_window_in_slot(window_index, action)
+        else:
+            self.latency_tracker.finish(window_index, action)
+
+    def on_window_opened(self, context, window):
+        window_index = context["slot"]
+        # Workspace restores open windows too, without a hotkey trace
+        if (action := self.opening_slots.pop(window_index, None)) is not None:
+            self.latency_tracker.finish(window_index, action)
+        if not window:
+            self.debug_terminal.append(
+                f"Timeout waiting for the window of slot {window_index} to appear."
+            )
+            return
+        self.ensure_window_slot(window_index)
+        self.set_slot_window(window_index, window)
+        # Workspace restores bring the slot's exe and title along
+        for key in ("exe_path", "window_title"):
+            if key in context:
+                self.all_windows[window_index][key] = context[key]
+
+    def set_slot_window(self, window_index, window):
+        """Bind a window to a slot, the one it replaces stops being mirrored unless another slot has it."""
+        slot = self.all_windows[window_index]
+        handle = window.getHandle() if window else None
+        previous = slot["window_object"]
+        if previous and (previous_handle := previous.getHandle()) != handle:
+            # Every mirrored window keeps a watchdog thread polling the window manager
+            if not any(
+                other is not slot and other["window_handle"] == previous_handle
+                for other in self.all_windows
+            ):
+                self.detector_commands.submit(
+                    self.window_detector_worker.state_mirror.unwatch, previous
+                )
+        slot["window_object"] = window
+        slot["window_handle"] = handle
+        if window:
+            self.detector_commands.submit(
+                self.window_detector_worker.watch_window, window
+            )
+
     def on_mouse_move(self, x, y):
+        # The listener only notifies once per drain, the position itself is read on the next frame
+        if not self.mouse_frame_timer.isActive():
+            self.mouse_frame_timer.start(self.frame_interval)
+
+    def drain_mouse_position(self):
+        if not self.mouse_pynput_worker.take_mouse_position():
+            return
         if self.guidanceWindow:
+            # pynput reports physical pixels, QCursor gives the matching logical position
             delta = QCursor.pos() - QPoint(0, 50)
             # self.debug_terminal.append(f"Mouse Position: {QCursor.pos()}")  # Debugging
             self.guidanceWindow.move(delta)
-        else:
-            pass
+
+    def track_guidance_window(self, guidance_window):
+        # Guidance windows follow the cursor, so mouse moves are needed until they close
+        self.mouse_pynput_worker.subscribe_mouse_moves()
+        guidance_window.closed.connect(self.mouse_pynput_worker.unsubscribe_mouse_moves)
 
     def create_guidance_window(
         self,
@@ -577,7 +953,7 @@ class MainWindow(QMainWindow):
         cursor_pos = QCursor.pos()
         x = cursor_pos.x() - 0
         y = cursor_pos.y() - 50
-        print("Cursor Position: ", x, y)
+        logger.debug("Cursor Position: %s %s", x, y)
         if show_and_destroy:
             self.guidanceWindow.closeWindow()
             self.guidanceWindow = None
@@ -590,10 +966,11 @@ class MainWindow(QMainWindow):
                 fade_out=window_fade_out,
                 font=self.custom_font,
             )  # Create a new window with new text
+            self.track_guidance_window(self.guidanceWindow)
             self.guidanceWindow.show()
             self.timer = QTimer()
             self.timer.timeout.connect(self.guidanceWindow.closeWindow)
-            print("Timer Started")
+            logger.debug("Timer Started")
             self.timer.start(2000)
 
         elif self.guidanceWindow:
@@ -608,6 +985,7 @@ class MainWindow(QMainWindow):
                 fade_out=window_fade_out,
                 font=self.custom_font,
             )  # Create a new window with new text
+            self.track_guidance_window(self.guidanceWindow)
             self.guidanceWindow.show()
         else:
             self.guidanceWindow = GuidanceWindow(
@@ -619,25 +997,121 @@ class MainWindow(QMainWindow):
                 fade_out=window_fade_out,
                 font=self.custom_font,
             )
+            self.track_guidance_window(self.guidanceWindow)
             self.guidanceWindow.show()
 
     def kill_process_by_name(self, process_name):
-        self.window_detector_worker.kill_process_by_name(process_name.lower())
+        self.detector_commands.submit(
+            self.window_detector_worker.kill_process_by_name,
+            process_name.lower(),
+            on_done=lambda future: self.report_terminated_processes(
+                process_name, future
+            ),
+        )
         # Depracated (but for the future)
 
-    def open_last_active_window(self):
-        if self.last_active_window:
-            self.window_detector_worker.ctrl_window(self.last_active_window)
+    def report_terminated_processes(self, process_name, future):
+        if future.exception():
+            return
+        outcomes = future.result()
+        self.debug_terminal.append(f"{process_name}: {len(outcomes)} processes")
+        for pid, outcome in sorted(outcomes.items()):
+            self.debug_terminal.append(f"  {pid}: {outcome}")
+
+    def open_last_active_window(self, depth=1):
+        self.submit_window_command(
+            depth,
+            "switch_recent",
+            self.window_detector_worker.switch_to_recent_window,
+            depth,
+            on_done=self.on_recent_window_switched,
+        )
+
+    def on_recent_window_switched(self, window):
+        if window:
+            self.last_active_window = window
         else:
             self.debug_terminal.append(
                 "No last active window found, please get one first <3"
             )
 
+    def open_quick_switcher(self):
+        if self.quick_switcher:
+            self.quick_switcher.activateWindow()
+            return
+        # The hotkeys stay on (typing can't match a modifier chord), but Esc is the switcher's
+        self.keyboard_pynput_worker.pause_esc_exit()
+        screen = self.app.primaryScreen().availableGeometry()
+        self.quick_switcher = QuickSwitcher(
+            self.title_index,
+            coordinates=(screen.center().x() - 375, screen.center().y() - 210),
+            font=self.custom_font,
+        )
+        self.quick_switcher.window_selected.connect(self.switch_to_window)
+        self.quick_switcher.closed.connect(self.on_quick_switcher_closed)
+        # The last results show right away, the refresh updates them
+        self.quick_switcher.update_results()
+        self.quick_switcher.show()
+        self.refresh_title_index()
+        # Windows opened, closed or renamed while it's open show up too
+        self.title_refresh_timer.start()
+
+    def refresh_title_index(self):
+        self.detector_commands.submit(
+            self.window_detector_worker.get_title_entries,
+            priority=PRIORITY_BACKGROUND,
+            on_done=self.on_title_entries,
+        )
+
+    def on_title_entries(self, future):
+        if future.exception():
+            return
+        self.title_index.update(
+            future.result(), self.window_detector_worker.extract_app_name
+        )
+        if self.quick_switcher:
+            self.quick_switcher.update_results(keep_selection=True)
+
+    def on_quick_switcher_closed(self):
+        self.title_refresh_timer.stop()
+        # The Esc that closed it is released after this, and mustn't exit the app
+        self.keyboard_pynput_worker.resume_esc_exit(
+            after_release=self.quick_switcher.closed_by_escape
+        )
+        self.quick_switcher = None
+
+    def switch_to_window(self, window):
+        self.detector_commands.submit(
+            self.window_detector_worker.activate_window, window
+        )
+
+    def dump_latency_stats(self):
+        report = self.latency_tracker.report()
+        logger.info(report)
+        self.debug_terminal.append(report)
+
     def print_key(self, key):
-        self.statusBar().showMessage(f"Key Pressed: {key}", 2500)
+        self.pending_status_key = key
+        self.schedule_gui_flush()
 
     def print_release_key(self, key):
-        self.debug_terminal.append(f"Key Pressed: {key}")
+        self.pending_terminal_lines.append(f"Key Pressed: {key}")
+        self.schedule_gui_flush()
+
+    def schedule_gui_flush(self):
+        # Only one flush per frame, however many updates arrive before it
+        if not self.gui_flush_timer.isActive():
+            self.gui_flush_timer.start(self.frame_interval)
+
+    def flush_gui_updates(self):
+        if self.pending_status_key is not None:
+            self.statusBar().showMessage(
+                f"Key Pressed: {self.pending_status_key}", 2500
+            )
+            self.pending_status_key = None
+        if self.pending_terminal_lines:
+            self.debug_terminal.append("\n".join(self.pending_terminal_lines))
+            self.pending_terminal_lines = []
 
     def toolbar_action_1(self):
         # Control the keyboard listener
@@ -662,33 +1136,45 @@ class MainWindow(QMainWindow):
             self.debug_terminal.append("Failed to load font")
 
     def quit_app(self):
-        print("Stopping Pynput Listener")
-        self.keyboard_pynput_worker.stop_listener()
-        self.keyboard_pynput_worker.can_run = False
-        print("Quitting Thread")
-        self.keyboard_pynput_thread.quit()
-        print("Waiting for Keyboard Thread")
-        self.keyboard_pynput_thread.wait(deadline=2500)
-
-        print("Stopping Mouse Pynput Listener")
-        self.mouse_pynput_worker.stop_mouse_listener(terminate=True)
-        self.mouse_pynput_worker.can_mouse_run = False
-        print("Quitting Mouse Thread")
-        self.mouse_pynput_thread.quit()
-        print("Waiting for Mouse Thread")
-        self.mouse_pynput_thread.wait(deadline=2500)
-
-        print("Quit Window Detector Thread")
+        logger.info("Stopping Pynput Listeners")
+        self.input_hub.shutdown()
+        logger.info("Quitting Input Thread")
+        self.input_hub_thread.quit()
+        logger.info("Waiting for Input Thread")
+        self.input_hub_thread.wait(deadline=2500)
+        self.keyboard_pynput_worker.stop_recording()
+
+        self.title_refresh_timer.stop()
+        self.detector_commands.cancel_all()
+        self.window_detector_worker.state_mirror.stop()
+        logger.info("Quit Window Detector Thread")
         self.window_detector_thread.quit()
-        print("Waiting for Window Detector Thread")
+        logger.info("Waiting for Window Detector Thread")
         self.window_detector_thread.wait(deadline=2500)
 
-        print("Quitting App")
+        logger.info("Quitting App")
         self.app.quit()
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow(app)
+    parser = argparse.ArgumentParser(description="XYZ Manager")
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Record the raw key events to a file that replay.py can play back",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Console logging level (can also be toggled from the File menu)",
+    )
+    args, qt_args = parser.parse_known_args()
+    setup_logging(args.log_level)
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow(app, record_path=args.record)
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    stop_logging()
+    sys.exit(exit_code)
@@ -0,0 +1,166 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+The process index keeps the running processes indexed by pid, lowercased name, exe basename,
+and the words of their command lines, so finding a process doesn't scan all of them.
+A refresh only diffs the pid list: new processes are read once, gone ones are dropped,
+and a pid that was reused by a new process is caught by comparing its create time on a hit.
+"""
+
+import logging
+import os
+import time
+import psutil
+
+logger = logging.getLogger(__name__)
+
+PROCESS_ATTRS = ["pid", "name", "exe", "cmdline", "create_time"]
+
+
+class ProcessIndex:
+    def __init__(self, ttl=1.0):
+        self.ttl = ttl
+        self.refreshed_at = None
+        self.records = {}  # pid -> record dict
+        self.by_name = {}  # lowercased name -> set of pids
+        self.by_exe = {}  # lowercased exe basename -> set of pids
+        self.by_token = {}  # lowercased cmdline word -> set of pids
+
+    def invalidate(self):
+        self.refreshed_at = None
+
+    def is_stale(self):
+        return (
+            self.refreshed_at is None or time.monotonic() - self.refreshed_at > self.ttl
+        )
+
+    def refresh(self, force=False):
+        if not force and not self.is_stale():
+            return
+        pids = set(psutil.pids())
+        gone = self.records.keys() - pids
+        new = pids - self.records.keys()
+        for pid in gone:
+            self.remove(pid)
+        for pid in new:
+            self.add(pid)
+        self.refreshed_at = time.monotonic()
+        if gone or new:
+            logger.debug(
+                "Process index refreshed: %d processes (%d new, %d gone)",
+                len(self.records),
+                len(new),
+                len(gone),
+            )
+
+    def add(self, pid):
+        try:
+            process = psutil.Process(pid)
+            # Denied fields are None, like process_iter(attrs=...) reports them
+            info = process.as_dict(attrs=PROCESS_ATTRS, ad_value=None)
+        except psutil.Error:
+            # Gone (or a zombie we can't even open) since the pid list was taken
+            return
+
+        name = info["name"] or ""
+        exe = info["exe"]
+        cmdline = " ".join(info["cmdline"]) if info["cmdline"] else ""
+        record = {
+            "pid": pid,
+            "name": info["name"],
+            "exe": exe,
+            "process": process,
+            "create_time": info["create_time"],
+            "name_lower": name.lower(),
+            "exe_basename_lower": os.path.basename(exe).lower() if exe else "",
+            "cmdline_lower": cmdline.lower(),
+        }
+        self.records[pid] = record
+        self.by_name.setdefault(record["name_lower"], set()).add(pid)
+        self.by_exe.setdefault(record["exe_basename_lower"], set()).add(pid)
+        for token in set(record["cmdline_lower"].split()):
+            self.by_token.setdefault(token, set()).add(pid)
+
+    def remove(self, pid):
+        record = self.records.pop(pid, None)
+        if not record:
+            return
+        self.discard_from(self.by_name, record["name_lower"], pid)
+        self.discard_from(self.by_exe, record["exe_basename_lower"], pid)
+        for token in set(record["cmdline_lower"].split()):
+            self.discard_from(self.by_token, token, pid)
+
+    def discard_from(self, index, key, pid):
+        if pids := index.get(key):
+            pids.discard(pid)
+            if not pids:
+                del index[key]
+
+    def validate(self, pids):
+        """Return the records of the pids that still run the process that was indexed, by pid."""
+        records = []
+        for pid in sorted(pids):
+            record = self.records.get(pid)
+            if not record:
+                continue
+            # is_running() compares the create time, so a reused pid is caught here
+            if not record["process"].is_running():
+                self.remove(pid)
+                self.add(pid)
+                record = self.records.get(pid)
+                if not record:
+                    continue
+            records.append(record)
+        return records
+
+    def get_all(self):
+        self.refresh()
+        return self.validate(self.records.keys())
+
+    def get_by_pid(self, pid):
+        self.refresh()
+        records = self.validate([pid])
+        return records[0] if records else None
+
+    def find_by_name(self, name):
+        """Processes whose name or exe basename is the given name, with or without ".exe"."""
+        self.refresh()
+        name = name.lower()
+        pids = set()
+        for key in (name, f"{name}.exe"):
+            pids |= self.by_name.get(key, set())
+            pids |= self.by_exe.get(key, set())
+        return self.validate(pids)
+
+    def find_by_name_containing(self, text):
+        """Processes whose lowercased name contains the text."""
+        self.refresh()
+        text = text.lower()
+        pids = set()
+        # Distinct names are far fewer than processes
+        for name, name_pids in self.by_name.items():
+            if text in name:
+                pids |= name_pids
+        return self.validate(pids)
+
+    def find_by_text(self, text):
+        """Processes whose command line or name contains the text (ignoring case)."""
+        self.refresh()
+        text = text.lower()
+        pids = set()
+        if words := text.split():
+            # Any match holds the longest word within a single cmdline word
+            word = max(words, key=len)
+            for token, token_pids in self.by_token.items():
+                if word in token:
+                    pids |= token_pids
+        else:
+            pids = set(self.records.keys())
+        for name, name_pids in self.by_name.items():
+            if text in name:
+                pids |= name_pids
+
+        return [
+            record
+            for record in self.validate(pids)
+            if text in record["cmdline_lower"] or text in record["name_lower"]
+        ]
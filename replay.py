@@ -0,0 +1,154 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+Record and replay of the raw keyboard stream seen by the KeyboardListener.
+The recorder writes every press/release as a compact JSON line (time delta + key descriptor).
+The replay driver feeds a recording through the same normalization, detect_combinations and
+execute_action code with no real keyboard, either at the original speed or as fast as possible,
+and reports the throughput and the actions that were detected.
+Usage: python replay.py recording.xyzkeys [--preferences preferences.ini] [--realtime]
+"""
+
+import argparse
+import configparser
+import json
+import os
+import sys
+import time
+
+# Replays run on CI boxes without a display, where pynput can only load its dummy backend
+if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+    os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+from input_listener import KeyboardListener
+
+RECORDING_HEADER = {"format": "xyz-manager-keys", "version": 1}
+
+
+class KeyEventRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write(json.dumps(RECORDING_HEADER) + "\n")
+        self.last_event_time = None
+
+    def record(self, pressed, key, event_time):
+        # Microseconds since the previous event, then the (vk, char, name) descriptor
+        if self.last_event_time is None:
+            delta = 0
+        else:
+            delta = round((event_time - self.last_event_time) * 1_000_000)
+        self.last_event_time = event_time
+        vk, char, name = key
+        self.file.write(
+            json.dumps([delta, int(pressed), vk, char, name], separators=(",", ":"))
+            + "\n"
+        )
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def load_key_events(path):
+    """Return the recorded events as (seconds since start, pressed, descriptor) tuples."""
+    events = []
+    with open(path, encoding="utf-8") as recording:
+        header = json.loads(recording.readline())
+        if header.get("format") != RECORDING_HEADER["format"]:
+            raise ValueError(f"{path} is not a key events recording")
+
+        offset = 0.0
+        for line in recording:
+            if not line.strip():
+                continue
+            delta, pressed, vk, char, name = json.loads(line)
+            offset += delta / 1_000_000
+            events.append((offset, bool(pressed), (vk, char, name)))
+    return events
+
+
+def replay_key_events(events, config_file, realtime=False):
+    listener = KeyboardListener(config_file)
+    detected_actions = []
+    listener.window_action.connect(
+        lambda slot, action: detected_actions.append(f"{action} window {slot}")
+    )
+    listener.configure_window.connect(
+        lambda: detected_actions.append("configure window")
+    )
+    listener.quit_requested.connect(lambda: detected_actions.append("quit"))
+    listener.latency_dump_requested.connect(
+        lambda: detected_actions.append("dump latency stats")
+    )
+    listener.quick_switcher_requested.connect(
+        lambda: detected_actions.append("open quick switcher")
+    )
+
+    start_time = time.perf_counter()
+    processed = 0
+    for offset, pressed, key in events:
+        # The listener's deadlines run on the recorded clock, so replays are deterministic
+        event_time = start_time + offset
+        if realtime:
+            if (delay := event_time - time.perf_counter()) > 0:
+                time.sleep(delay)
+
+        # Fire the chord and stale keys timeouts that expired before this event
+        while (deadline := listener.get_next_deadline()) is not None:
+            if deadline > event_time:
+                break
+            listener.handle_deadlines(deadline)
+
+        processed += 1
+        if not listener.process_key_event(pressed, key, event_time):
+            break
+    else:
+        while (deadline := listener.get_next_deadline()) is not None:
+            listener.handle_deadlines(deadline)
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "events": processed,
+        "elapsed": elapsed,
+        "events_per_second": processed / elapsed if elapsed else float("inf"),
+        "actions": detected_actions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded key stream.")
+    parser.add_argument("recording", help="File written by main.py --record")
+    parser.add_argument(
+        "--preferences",
+        help="preferences.ini holding the keyboard shortcuts (defaults to the user's one)",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Keep the original timing instead of replaying as fast as possible",
+    )
+    args = parser.parse_args()
+
+    if args.preferences:
+        config_file = configparser.ConfigParser()
+        if not config_file.read(args.preferences):
+            sys.exit(f"Could not read {args.preferences}")
+    else:
+        from config import UserConfig
+
+        config_file = UserConfig().GOD["preferences.ini"]["file"]
+
+    result = replay_key_events(
+        load_key_events(args.recording), config_file, realtime=args.realtime
+    )
+    print(
+        f"Replayed {result['events']} events in {result['elapsed']:.3f}s"
+        f" ({result['events_per_second']:.0f} events/sec)"
+    )
+    print(f"Detected {len(result['actions'])} actions:")
+    for action in result["actions"]:
+        print(f"  {action}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+The platform specific parts of the window detector: finding the process behind a window,
+launching apps so their process can be followed, and reporting focus changes as they happen.
+The backend for the running platform is picked and imported on first use, so only its own
+dependencies are loaded (pywin32 on Windows, python-xlib on Linux).
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import psutil
+
+logger = logging.getLogger(__name__)
+
+_backend = None
+
+
+def get_window_backend():
+    """Return the backend of the running platform, created on the first call."""
+    global _backend
+    if _backend is None:
+        if sys.platform.startswith("win32"):
+            _backend = WindowsBackend()
+        elif sys.platform.startswith("linux"):
+            _backend = LinuxBackend()
+        elif sys.platform.startswith("darwin"):
+            _backend = MacBackend()
+        else:
+            _backend = WindowBackend()
+        logger.debug("Window backend: %s", type(_backend).__name__)
+    return _backend
+
+
+class WindowBackend:
+    """Fallback for unknown platforms, and the shared parts of the others."""
+
+    # Whether run_focus_watcher is implemented
+    supports_focus_events = False
+
+    def get_window_pid(self, handle):
+        return None
+
+    def get_exe_path(self, handle):
+        # Get the process ID associated with the window handle
+        if not (pid := self.get_window_pid(handle)):
+            return None
+        # Find the process using psutil
+        try:
+            return psutil.Process(pid).exe()
+        except psutil.Error:
+            return None
+
+    def launch(self, exe_path):
+        """Start the app, returns its psutil.Process when we spawned it directly (None otherwise)."""
+        return None
+
+    def watch_focus(self, on_focus, on_closed):
+        """
+        From a background thread, call on_focus(handle) whenever another window gets the focus,
+        and on_closed(handle) when a window is closed (on the platforms that report it cheaply).
+        Returns False when the platform doesn't report focus changes.
+        """
+        if not self.supports_focus_events:
+            return False
+        threading.Thread(
+            target=self.run_focus_watcher,
+            args=(on_focus, on_closed),
+            name="focus-watcher",
+            daemon=True,
+        ).start()
+        return True
+
+    def run_focus_watcher(self, on_focus, on_closed):
+        pass
+
+    def spawn(self, args, **kwargs):
+        popen = subprocess.Popen(args, **kwargs)
+        return psutil.Process(popen.pid)
+
+
+class WindowsBackend(WindowBackend):
+    supports_focus_events = True
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+
+    def __init__(self):
+        import win32process
+
+        self.win32process = win32process
+
+    def get_window_pid(self, handle):
+        _, pid = self.win32process.GetWindowThreadProcessId(handle)
+        return pid
+
+    def launch(self, exe_path):
+        if not exe_path.lower().endswith(".exe"):
+            subprocess.run(f'start "" "{exe_path}"', shell=True)
+            return None
+        return self.spawn(
+            [exe_path],
+            creationflags=subprocess.DETACHED_PROCESS
+            | subprocess.CREATE_NEW_PROCESS_GROUP,
+        )
+
+    def run_focus_watcher(self, on_focus, on_closed):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+
+        # Closed windows aren't hooked, a system-wide destroy hook would wake us for every
+        # menu and tooltip. switch_to_recent_window drops them when activating them fails
+        def on_foreground(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            if hwnd and id_object == self.OBJID_WINDOW:
+                on_focus(hwnd)
+
+        # Kept in a local for as long as the hook lives, or ctypes would free it
+        event_proc = WinEventProc(on_foreground)
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        hook = user32.SetWinEventHook(
+            self.EVENT_SYSTEM_FOREGROUND,
+            self.EVENT_SYSTEM_FOREGROUND,
+            0,
+            event_proc,
+            0,
+            0,
+            self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS,
+        )
+        if not hook:
+            logger.warning("Could not hook the foreground window changes")
+            return
+
+        if hwnd := user32.GetForegroundWindow():
+            on_focus(hwnd)
+        # Out of context hooks are delivered through this thread's message loop
+        message = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(message), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(message))
+            user32.DispatchMessageW(ctypes.byref(message))
+        user32.UnhookWinEvent(hook)
+
+
+class LinuxBackend(WindowBackend):
+    supports_focus_events = True
+
+    def __init__(self):
+        from Xlib import X, Xatom, display
+
+        self.X = X
+        self.Xatom = Xatom
+        self.display_module = display
+        self.display = display.Display()
+        # EWMH: the pid of the client that owns the window
+        self.net_wm_pid = self.display.intern_atom("_NET_WM_PID")
+
+    def get_window_pid(self, handle):
+        try:
+            window = self.display.create_resource_object("window", handle)
+            prop = window.get_full_property(self.net_wm_pid, self.Xatom.CARDINAL)
+        except Exception as e:
+            # The window is gone, or the X server refused the request
+            logger.debug("Could not read _NET_WM_PID of %s: %s", handle, e)
+            return None
+        if prop and len(prop.value):
+            return int(prop.value[0])
+        return None
+
+    def get_exe_path(self, handle):
+        if not (pid := self.get_window_pid(handle)):
+            return None
+        try:
+            exe_path = os.readlink(f"/proc/{pid}/exe")
+        except OSError:
+            return None
+        # An exe that was replaced on disk (e.g. upgraded) while running
+        return exe_path.removesuffix(" (deleted)")
+
+    def launch(self, exe_path):
+        if os.access(exe_path, os.X_OK):
+            return self.spawn([exe_path], start_new_session=True)
+        # Not a program (e.g. a document), let the desktop pick the app for it
+        return self.spawn(["xdg-open", exe_path], start_new_session=True)
+
+    def run_focus_watcher(self, on_focus, on_closed):
+        # A connection of its own, as this thread blocks on it waiting for events
+        focus_display = self.display_module.Display()
+        root = focus_display.screen().root
+        net_active_window = focus_display.intern_atom("_NET_ACTIVE_WINDOW")
+        net_client_list = focus_display.intern_atom("_NET_CLIENT_LIST")
+        # The window manager updates these root properties on every focus change and
+        # whenever a window is mapped or closed
+        root.change_attributes(event_mask=self.X.PropertyChangeMask)
+
+        if active := self.read_root_windows(root, net_active_window):
+            on_focus(active[0])
+        clients = set(self.read_root_windows(root, net_client_list))
+        while True:
+            event = focus_display.next_event()
+            if event.type != self.X.PropertyNotify:
+                continue
+            if event.atom == net_active_window:
+                if active := self.read_root_windows(root, net_active_window):
+                    on_focus(active[0])
+            elif event.atom == net_client_list:
+                current = set(self.read_root_windows(root, net_client_list))
+                for handle in clients - current:
+                    on_closed(handle)
+                clients = current
+
+    def read_root_windows(self, root, atom):
+        prop = root.get_full_property(atom, self.X.AnyPropertyType)
+        if not prop:
+            return []
+        # _NET_ACTIVE_WINDOW is 0 while nothing has the focus
+        return [int(handle) for handle in prop.value if handle]
+
+
+class MacBackend(WindowBackend):
+    def launch(self, exe_path):
+        # open hands the launch to LaunchServices, so the app isn't our descendant
+        subprocess.run(["open", exe_path])
+        return None
@@ -7,23 +7,191 @@ It can also detect the execution path of a window (.exe) and open a file after i
 But some of the feature are still not as robust (WIP).
 """
 
-from PySide6.QtCore import QObject
+from PySide6.QtCore import QObject, QTimer, Signal
+from concurrent.futures import Future, ThreadPoolExecutor
+import concurrent.futures
+import sys
+
+if sys.platform.startswith("linux"):
+    # python-xlib only locks its Display when this was imported before the Display was made.
+    # pywinctl shares one Display across the batch pool and watchdog threads
+    import Xlib.threaded
 import pywinctl as pwc
 import psutil
 import re
 import os
 import platform
-import subprocess
-import sys
-import win32process
 import time
+import logging
+from window_index import WindowMRUStack, WindowSpatialIndex
+from app_matcher import AppNameMatcher
+from process_index import ProcessIndex
+from window_backends import get_window_backend
+from window_state import WindowStateMirror
+
+logger = logging.getLogger(__name__)
+
+# While waiting for a launched app's window, the polls back off from the first delay to the max
+OPEN_WINDOW_FIRST_POLL = 0.05
+OPEN_WINDOW_MAX_POLL = 1.0
+
+# Operations run_batch can apply to many windows at once, by the window method they call
+BATCH_OPERATIONS = {
+    "minimize": "minimize",
+    "maximize": "maximize",
+    "restore": "restore",
+    "close": "close",
+}
+# Per-window results of run_batch besides the errors
+BATCH_DONE = "done"
+BATCH_TIMED_OUT = "timed out"
+
+# Per-process outcomes of terminate_processes
+PROCESS_TERMINATED = "terminated"
+PROCESS_KILLED = "killed"
+PROCESS_GONE = "already gone"
+PROCESS_ACCESS_DENIED = "access denied"
+PROCESS_SURVIVED = "survived"
+
+
+class WindowRegistry:
+    """
+    Snapshot of the open windows, handle -> title and pid, ordered topmost first.
+    Lookups are served from the snapshot until it's older than the ttl or invalidated.
+    A refresh lists the handles once and diffs them against the snapshot: only new windows get
+    their pid read, the known ones just re-read their title.
+    Geometry and state change too often to be worth caching, read_window_state reads them
+    for the callers that need them.
+    """
+
+    def __init__(self, ttl=0.5):
+        self.ttl = ttl
+        self.records = {}  # handle -> record dict
+        self.handles = []  # handles, topmost first
+        self.refreshed_at = None
+        # pywinctl lists X11 windows bottom to top, and the other platforms top to bottom
+        self.windows_listed_bottom_up = sys.platform.startswith("linux")
+
+    def invalidate(self):
+        self.refreshed_at = None
+
+    def is_stale(self):
+        return (
+            self.refreshed_at is None or time.monotonic() - self.refreshed_at > self.ttl
+        )
+
+    def refresh(self, force=False):
+        if not force and not self.is_stale():
+            return
+        all_windows = pwc.getAllWindows()
+        if self.windows_listed_bottom_up:
+            all_windows = reversed(all_windows)
+
+        records = {}
+        handles = []
+        for window in all_windows:
+            try:
+                handle = window.getHandle()
+                if record := self.records.get(handle):
+                    record["window"] = window
+                else:
+                    record = {
+                        "window": window,
+                        "handle": handle,
+                        "pid": window.getPID(),
+                    }
+                self.read_title(record)
+            except Exception as e:
+                # Windows can close while they are being listed
+                logger.debug("Skipping window while refreshing: %s", e)
+                continue
+            records[handle] = record
+            handles.append(handle)
+
+        logger.debug(
+            "Window registry refreshed: %d windows (%d new, %d gone)",
+            len(records),
+            len(records.keys() - self.records.keys()),
+            len(self.records.keys() - records.keys()),
+        )
+        self.records = records
+        self.handles = handles
+        self.refreshed_at = time.monotonic()
+
+    def read_title(self, record):
+        title = record["window"].title or ""
+        record["title"] = title
+        record["title_lower"] = title.lower()
+
+    def read_window_state(self, records):
+        """Read the geometry and state of the records, returns those whose window is still open."""
+        read = []
+        for record in records:
+            window = record["window"]
+            try:
+                record["rect"] = tuple(window.rect)
+                record["minimized"] = window.isMinimized
+                record["visible"] = window.isVisible
+            except Exception as e:
+                logger.debug("Skipping window while reading its state: %s", e)
+                continue
+            read.append(record)
+        return read
+
+    def get_records(self):
+        """All the records, topmost first."""
+        self.refresh()
+        return [self.records[handle] for handle in self.handles]
+
+    def get_record(self, handle):
+        self.refresh()
+        return self.records.get(handle)
+
+    def get_windows(self):
+        return [record["window"] for record in self.get_records()]
+
+    def get_windows_with_title(self, title):
+        """Windows whose title contains the given text, ignoring case (topmost first)."""
+        title = title.lower()
+        return [
+            record["window"]
+            for record in self.get_records()
+            if title in record["title_lower"]
+        ]
 
 
 class WindowDetector(QObject):
+    # context given to open_window_async (a dict with the slot), window (None on timeout)
+    window_opened = Signal(object, object)
+    open_window_requested = Signal(object)
+    # Handles from the backend's focus watcher thread, of the newly focused or a closed window
+    focus_changed = Signal(object)
+    focused_window_closed = Signal(object)
+
     def __init__(self):
         super().__init__()
+        # Emitted from the caller's thread, handled on the detector's thread
+        self.open_window_requested.connect(self.start_open_window)
+        self.focus_changed.connect(self.on_focus_changed)
+        self.focused_window_closed.connect(self.on_focused_window_closed)
 
         self.windows = {}
+        # Every title and handle lookup is served from here instead of querying the window manager
+        self.window_registry = WindowRegistry()
+        # Visible window rectangles, so a click can be resolved to the window under it
+        self.window_index = WindowSpatialIndex()
+        # Finds the app names in the window titles, rebuilt only when the apps change
+        self.app_name_matcher = AppNameMatcher()
+        # Running processes by name, exe and cmdline, refreshed by diffing the pids
+        self.process_index = ProcessIndex()
+        # State of the managed windows, kept up to date by their watchdogs
+        self.state_mirror = WindowStateMirror()
+        # The windows by when they were last focused, fed by the backend's focus events
+        self.recent_windows = WindowMRUStack()
+        # Batches call the window manager concurrently, bounded by this pool
+        self.batch_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="window-batch"
+        )
 
         # Check if macOS
         if platform.system() == "Darwin":
@@ -37,58 +205,277 @@ class WindowDetector(QObject):
         else:
             return None
 
+    def refresh_window_index(self):
+        # Windows may have moved since the last refresh, so the clicks need a fresh snapshot
+        self.window_registry.refresh(force=True)
+        own_pid = os.getpid()
+        # Skip our own windows (the guidance window sits right under the cursor)
+        records = [
+            record
+            for record in self.window_registry.get_records()
+            if record["pid"] != own_pid
+        ]
+        entries = []
+        for record in self.window_registry.read_window_state(records):
+            if record["minimized"] or not record["visible"]:
+                continue
+            entries.append((record["handle"], record["rect"], record["window"]))
+        self.window_index.update(entries)
+
+    def get_window_at(self, x, y):
+        return self.window_index.window_at(x, y)
+
+    def watch_window(self, window):
+        # Managed windows are mirrored, so their hotkeys don't need to query their state
+        if window:
+            self.state_mirror.watch(window)
+
     def ctrl_window(self, window):
-        if window.isMinimized:
+        if state := self.state_mirror.get_state(window):
+            minimized = state["minimized"]
+        else:
+            minimized = window.isMinimized
+        if minimized:
             window.restore()
         else:
             window.minimize()
+        self.state_mirror.set_state(window, minimized=not minimized)
+        self.window_registry.invalidate()
+
+    def start_focus_tracking(self):
+        if not get_window_backend().watch_focus(
+            self.focus_changed.emit, self.focused_window_closed.emit
+        ):
+            logger.info("Focus changes aren't reported on this platform")
+
+    def on_focus_changed(self, handle):
+        # Only the focused window is read, the window list isn't needed for it
+        if record := self.window_registry.records.get(handle):
+            window, pid = record["window"], record["pid"]
+        else:
+            try:
+                window = pwc.Window(handle)
+            except Exception as e:
+                # Closed again before we got to it
+                logger.debug("Skipping focused window %s: %s", handle, e)
+                return
+            pid = get_window_backend().get_window_pid(handle)
+        # Our own windows would always be on top, as the hotkeys' feedback shows there
+        if pid == os.getpid():
+            return
+        self.recent_windows.touch(handle, window)
 
-    def open_window(self, exe_path, window_title, timeout=10):
+    def on_focused_window_closed(self, handle):
+        self.recent_windows.remove(handle)
+
+    def switch_to_recent_window(self, depth=1):
+        """Activate the window focused 'depth' switches ago, returns it (None if there's none)."""
+        while recent := self.recent_windows.get_recent(depth):
+            handle, window = recent
+            try:
+                self.activate_window(window)
+            except Exception as e:
+                # Closed without the backend telling us, the next one takes its place
+                logger.debug("Dropping closed recent window %s: %s", handle, e)
+                self.recent_windows.remove(handle)
+                continue
+            return window
+        return None
+
+    def activate_window(self, window):
+        if window.isMinimized:
+            window.restore()
+            self.state_mirror.set_state(window, minimized=False)
+        window.activate()
+        self.window_registry.invalidate()
+
+    def get_title_entries(self):
+        """(handle, title, window) of every titled window but ours, topmost first."""
+        own_pid = os.getpid()
+        return [
+            (record["handle"], record["title"], record["window"])
+            for record in self.window_registry.get_records()
+            if record["title"] and record["pid"] != own_pid
+        ]
+
+    def launch_app(self, exe_path):
+        """Start the app, returns its psutil.Process when we spawned it directly (None otherwise)."""
         # os.startfile(exe_path)  # Simple method
-        if sys.platform.startswith("darwin"):
-            subprocess.run(["open", exe_path])
-        elif sys.platform.startswith("linux"):
-            subprocess.run(["xdg-open", exe_path])
-        elif sys.platform.startswith("win32"):
-            subprocess.run(f'start "" "{exe_path}"', shell=True)
-        # Wait for the window to appear
-        start_time = time.time()
-        while True:
-            new_windows = pwc.getWindowsWithTitle(
-                window_title, condition=pwc.Re.CONTAINS, flags=pwc.Re.IGNORECASE
-            )
-            if new_windows:
-                print(f"Windows Found: {new_windows}")
-                return new_windows[0]  # Returns a list of all matching windows
-            elif time.time() - start_time > timeout:
-                print("Timeout waiting for window to appear.")
-                return None
-            time.sleep(0.5)
+        try:
+            return get_window_backend().launch(exe_path)
+        except (OSError, psutil.Error) as e:
+            logger.warning("Could not launch %s: %s", exe_path, e)
+            return None
+
+    def start_launch(self, exe_path, window_title):
+        """Launch the app and return the state find_launched_window needs to spot its window."""
+        # The windows that exist before the launch can't be the new one
+        self.window_registry.refresh(force=True)
+        known_handles = set(self.window_registry.handles)
+        return {
+            "exe_path": exe_path,
+            "window_title": window_title,
+            "known_handles": known_handles,
+            "root_process": self.launch_app(exe_path),
+            "pids": set(),
+        }
+
+    def find_launched_window(self, launch):
+        """
+        Return the first window owned by the launched process or one of its descendants.
+        When there's no pid to follow (or the launcher handed off to an existing process),
+        fall back to a title match, among the windows that appeared since the launch only.
+        """
+        # Polls closer than the ttl share a snapshot, the new windows only show up in the next one
+        self.window_registry.refresh()
+        if root_process := launch["root_process"]:
+            # Descendants are kept once seen, they are reparented when a launcher exits
+            try:
+                launch["pids"].add(root_process.pid)
+                for child in root_process.children(recursive=True):
+                    launch["pids"].add(child.pid)
+            except psutil.Error:
+                pass
+
+        title = (launch["window_title"] or "").lower()
+        title_match = None
+        for record in self.window_registry.get_records():
+            if record["pid"] in launch["pids"]:
+                return record["window"]
+            if (
+                title_match is None
+                and title
+                and record["handle"] not in launch["known_handles"]
+                and title in record["title_lower"]
+            ):
+                title_match = record["window"]
+        return title_match
+
+    def open_window_async(self, exe_path, window_title, timeout=10, context=None):
+        """
+        Launch the app and wait for its window on the detector thread, without blocking the caller.
+        Returns a Future that resolves to the window (None on timeout), and window_opened
+        is emitted with the given context at the same time.
+        """
+        future = Future()
+        self.open_window_requested.emit(
+            {
+                "future": future,
+                "exe_path": exe_path,
+                "window_title": window_title,
+                "timeout": timeout,
+                "context": context,
+            }
+        )
+        return future
+
+    def start_open_window(self, request):
+        if not request["future"].set_running_or_notify_cancel():
+            return
+        request["launch"] = self.start_launch(
+            request["exe_path"], request["window_title"]
+        )
+        request["deadline"] = time.monotonic() + request["timeout"]
+        request["delay"] = OPEN_WINDOW_FIRST_POLL
+        self.poll_open_window(request)
+
+    def poll_open_window(self, request):
+        if window := self.find_launched_window(request["launch"]):
+            logger.debug("Window Found: %s", window)
+            self.finish_open_window(request, window)
+            return
+
+        remaining = request["deadline"] - time.monotonic()
+        if remaining <= 0:
+            logger.warning("Timeout waiting for window to appear.")
+            self.finish_open_window(request, None)
+            return
+        # Apps usually show up quickly, the slow ones are polled less and less often
+        delay = min(request["delay"], remaining)
+        request["delay"] = min(request["delay"] * 2, OPEN_WINDOW_MAX_POLL)
+        QTimer.singleShot(int(delay * 1000), lambda: self.poll_open_window(request))
+
+    def finish_open_window(self, request, window):
+        request["future"].set_result(window)
+        self.window_opened.emit(request["context"], window)
 
     def close_window(self, window):
         if window:
             window.close()
+            self.state_mirror.unwatch(window)
+            self.window_registry.invalidate()
 
     def close_all_windows(self, window_title):
-        windows_to_delete = pwc.getWindowsWithTitle(
-            window_title, condition=pwc.Re.CONTAINS, flags=pwc.Re.IGNORECASE
-        )
+        windows_to_delete = self.window_registry.get_windows_with_title(window_title)
         if windows_to_delete:
-            print(f"Windows Found: {windows_to_delete}")
-            for window in windows_to_delete:
-                window.close()
+            logger.debug("Windows Found: %s", windows_to_delete)
+            return self.run_batch("close", windows_to_delete)
+        return {}
+
+    def minimize_other_windows(self, window):
+        """Minimize every visible window except the given one (and our own)."""
+        keep_handle = window.getHandle() if window else None
+        own_pid = os.getpid()
+        records = [
+            record
+            for record in self.window_registry.get_records()
+            if record["handle"] != keep_handle and record["pid"] != own_pid
+        ]
+        windows_to_minimize = [
+            record["window"]
+            for record in self.window_registry.read_window_state(records)
+            if record["visible"] and not record["minimized"]
+        ]
+        return self.run_batch("minimize", windows_to_minimize)
+
+    def run_batch(self, operation, windows, timeout=5.0):
+        """
+        Apply a BATCH_OPERATIONS operation to all the windows concurrently, within one deadline.
+        Returns handle -> BATCH_DONE, BATCH_TIMED_OUT or the error the call raised.
+        """
+        method_name = BATCH_OPERATIONS[operation]
+        futures = {
+            self.batch_executor.submit(getattr(window, method_name)): window.getHandle()
+            for window in windows
+        }
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+
+        results = {}
+        for future in done:
+            if error := future.exception():
+                results[futures[future]] = error
+            else:
+                results[futures[future]] = BATCH_DONE
+        for future in not_done:
+            # The ones that didn't start yet are dropped, the running ones are left to finish
+            future.cancel()
+            results[futures[future]] = BATCH_TIMED_OUT
+
+        failed = sum(result != BATCH_DONE for result in results.values())
+        logger.debug(
+            "Batch %s: %d windows, %d failed or timed out",
+            operation,
+            len(results),
+            failed,
+        )
+        self.window_registry.invalidate()
+        return results
 
     def maximize_window(self, window):
         if window:
             window.maximize()
+            self.state_mirror.set_state(window, maximized=True, minimized=False)
+            self.window_registry.invalidate()
 
     def minimize_window(self, window):
         if window:
             window.minimize()
+            self.state_mirror.set_state(window, minimized=True)
+            self.window_registry.invalidate()
 
     def detect_active_window(self):
         if self.platform:
-            print("Permissions: ", pwc.checkPermissions())
+            logger.debug("Permissions: %s", pwc.checkPermissions())
 
             if active_window := pwc.getActiveWindow():
                 return (
@@ -107,34 +494,28 @@ class WindowDetector(QObject):
                 return (None, None)
 
     def get_apps(self):
-        print("Getting apps...")
+        logger.debug("Getting apps...")
         apps = {}
         apps_names = pwc.getAllAppsNames()  # List of useful app names
-        all_windows = pwc.getAllWindows()  # List of Win32Window objects
         all_apps_windows_titles = pwc.getAllAppsWindowsTitles()
+        records = self.window_registry.get_records()
+        all_windows = [record["window"] for record in records]
         # print("Apps names: ", apps_names)
         # print("All windows: ", all_windows)
 
-        for window in all_windows:
-            if (
-                window_title := window.title
-            ):  # Accessing the title of the Win32Window object
-                for app_name in apps_names:
-                    app_name = app_name.split(".exe")[
-                        0
-                    ]  # Remove the ".exe" extension from the app name
-                    # Escape regex special characters in app name and compile regex pattern
-                    pattern = re.compile(
-                        r"\b" + re.escape(app_name) + r"\b", re.IGNORECASE
-                    )
-                    # print("App name: ", app_name)
-                    # print("Window Title: ", window_title)
-                    if re.search(pattern, window_title):
-                        apps[app_name] = window_title
+        # Remove the ".exe" extension from the app names
+        self.app_name_matcher.set_app_names(
+            app_name.split(".exe")[0] for app_name in apps_names
+        )
+        for record in records:
+            if window_title := record["title"]:  # Cached by the registry
+                # Every title is scanned once for all the app names (and memoized)
+                for app_name in self.app_name_matcher.match(window_title):
+                    apps[app_name] = window_title
         return apps, apps_names, all_windows, all_apps_windows_titles
 
     def parse_active_windows(self):
-        self.windows = pwc.getAllWindows()
+        self.windows = self.window_registry.get_windows()
 
     def extract_app_name(self, window_title):
         # Define the regex pattern to split by "-", "—", or spaces around them
@@ -154,21 +535,11 @@ class WindowDetector(QObject):
             )  # Return the original title with leading/trailing spaces removed
 
     def detect_all_processes(self):
-        processes = []
-        for process in psutil.process_iter(attrs=["pid", "name", "exe"]):
-            try:
-                processes.append(
-                    {
-                        "pid": process.info["pid"],
-                        "name": process.info["name"],
-                        "exe": process.info["exe"],
-                    }
-                )
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-            except psutil.NoSuchProcess:
-                continue
-        print("All processes fetched.")
+        processes = [
+            {"pid": record["pid"], "name": record["name"], "exe": record["exe"]}
+            for record in self.process_index.get_all()
+        ]
+        logger.debug("All processes fetched.")
         return processes
 
     def find_procs_by_name(self, name):
@@ -177,73 +548,89 @@ class WindowDetector(QObject):
         Each dictionary contains 'pid', 'name', and 'exe'.
         """
         assert name, "Name parameter is required"
-        matching_procs = []
-
-        for process in psutil.process_iter(attrs=["pid", "name", "exe"]):
-            try:
-                proc_name = process.info["name"]
-                proc_exe = process.info["exe"]
-                # Adjust the condition to check for both 'name' and 'name.exe'
-                if (
-                    proc_name.lower() == name.lower()
-                    or proc_name.lower() == f"{name.lower()}.exe"
-                    or (proc_exe and os.path.basename(proc_exe).lower() == name.lower())
-                    or (
-                        proc_exe
-                        and os.path.basename(proc_exe).lower() == f"{name.lower()}.exe"
-                    )
-                ):
-                    matching_procs.append(
-                        {"pid": process.info["pid"], "name": proc_name, "exe": proc_exe}
-                    )
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-            except psutil.NoSuchProcess:
-                continue
+        # Matches both 'name' and 'name.exe', against the process name and the exe's basename
+        matching_procs = [
+            {"pid": record["pid"], "name": record["name"], "exe": record["exe"]}
+            for record in self.process_index.find_by_name(name)
+        ]
 
-        print("Matching processes: ", matching_procs)
+        logger.debug("Matching processes: %s", matching_procs)
         return matching_procs
 
     # Find .exe by title
     def find_process_by_title(self, target_title):
-        # Iterate over all running processes
-        for proc in psutil.process_iter(attrs=["pid", "name", "exe", "cmdline"]):
-            # Try to access process details
-            try:
-                # Ensure cmdline is iterable (i.e., a list) before joining
-                cmdline = " ".join(proc.info["cmdline"]) if proc.info["cmdline"] else ""
-                # Check if the target title is part of the process' cmdline or name
-                if (
-                    target_title.lower() in cmdline.lower()
-                    or target_title.lower() in (proc.info["name"] or "").lower()
-                ):
-                    # Print .exe path
-                    print(proc.info["exe"])
-                    return proc.info["exe"]
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        # Check if the target title is part of the process' cmdline or name
+        if matching_procs := self.process_index.find_by_text(target_title):
+            # Print .exe path
+            logger.debug("Process exe: %s", matching_procs[0]["exe"])
+            return matching_procs[0]["exe"]
         return None
 
     def get_exe_path_from_window_handle(self, hwnd):
-        # Get the process ID associated with the window handle
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-
-        # Find the process using psutil
-        try:
-            p = psutil.Process(pid)
-            # Return the executable path
-            return p.exe()
-        except psutil.NoSuchProcess:
-            return None
+        # The platform's backend maps the window to its process, then to the executable
+        return get_window_backend().get_exe_path(hwnd)
 
     def kill_process_by_name(self, name):
-        # Loop through all running processes
-        for process in psutil.process_iter():
-            # Check if process name matches the desired one (e.g., "notepad.exe" for Notepad on Windows)
+        # Processes whose name contains the desired one (e.g., "notepad.exe" for Notepad on Windows)
+        processes = [
+            record["process"]
+            for record in self.process_index.find_by_name_containing(name)
+        ]
+        outcomes = self.terminate_processes(processes)
+        logger.debug("Function Finished.")
+        return outcomes
+
+    def terminate_processes(self, processes, timeout=3.0, kill_timeout=1.0):
+        """
+        Terminate the processes and their whole trees together, then kill whatever outlives the timeout.
+        Returns pid -> one of the PROCESS_ outcomes.
+        """
+        # Collect the trees first, children are reparented once their parent is gone
+        targets = {}
+        for process in processes:
             try:
-                if name in process.name().lower():
-                    process.terminate()  # Terminate the process
-                    print("Process terminated.")
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        print("Function Finished.")
+                children = process.children(recursive=True)
+            except psutil.Error:
+                children = []
+            for target in [process, *children]:
+                targets.setdefault(target.pid, target)
+
+        outcomes = {}
+        signalled = self.signal_processes(targets.values(), "terminate", outcomes)
+        # All of them are waited on at once, so the whole batch costs a single timeout
+        gone, alive = psutil.wait_procs(signalled, timeout=timeout)
+        for process in gone:
+            outcomes[process.pid] = PROCESS_TERMINATED
+
+        if alive:
+            # Hung processes ignore terminate, escalate
+            signalled = self.signal_processes(alive, "kill", outcomes)
+            gone, alive = psutil.wait_procs(signalled, timeout=kill_timeout)
+            for process in gone:
+                outcomes[process.pid] = PROCESS_KILLED
+            for process in alive:
+                outcomes[process.pid] = PROCESS_SURVIVED
+
+        self.process_index.invalidate()
+        logger.info(
+            "Terminated %d processes: %d killed, %d survived",
+            len(outcomes),
+            sum(outcome == PROCESS_KILLED for outcome in outcomes.values()),
+            sum(outcome == PROCESS_SURVIVED for outcome in outcomes.values()),
+        )
+        return outcomes
+
+    def signal_processes(self, processes, method_name, outcomes):
+        """Call terminate/kill on each process, returns the ones that got the signal."""
+        signalled = []
+        for process in processes:
+            try:
+                getattr(process, method_name)()
+            except psutil.NoSuchProcess:
+                # Exited on its own, or with its parent
+                outcomes.setdefault(process.pid, PROCESS_GONE)
+            except psutil.AccessDenied:
+                outcomes[process.pid] = PROCESS_ACCESS_DENIED
+            else:
+                signalled.append(process)
+        return signalled
@@ -0,0 +1,241 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+Indexes over the open windows, so lookups don't need a round trip to the window manager.
+WindowSpatialIndex is a uniform grid over the desktop: every cell lists the windows overlapping it,
+so finding the window under a point only checks the few windows in that point's cell.
+WindowMRUStack orders the windows by when they were last focused, fed by focus change events.
+TitleIndex maps the trigrams and short word prefixes of the window titles (and app names) to the
+windows, so the quick switcher ranks a query by trigram overlap without scanning every title.
+"""
+
+from collections import Counter, OrderedDict
+import heapq
+import re
+
+# Titles and queries are matched word by word
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class WindowSpatialIndex:
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> set of handles overlapping that cell
+        self.rects = {}  # handle -> (left, top, right, bottom)
+        self.z_order = {}  # handle -> stacking position, 0 is the topmost window
+        self.windows = {}  # handle -> window object
+
+    def cells_for_rect(self, rect):
+        left, top, right, bottom = rect
+        for column in range(left // self.cell_size, (right - 1) // self.cell_size + 1):
+            for row in range(top // self.cell_size, (bottom - 1) // self.cell_size + 1):
+                yield column, row
+
+    def insert(self, handle, rect, z, window):
+        left, top, right, bottom = rect
+        if right <= left or bottom <= top:
+            return
+        self.rects[handle] = rect
+        self.z_order[handle] = z
+        self.windows[handle] = window
+        for cell in self.cells_for_rect(rect):
+            self.cells.setdefault(cell, set()).add(handle)
+
+    def remove(self, handle):
+        rect = self.rects.pop(handle, None)
+        self.z_order.pop(handle, None)
+        self.windows.pop(handle, None)
+        if rect is None:
+            return
+        for cell in self.cells_for_rect(rect):
+            if handles := self.cells.get(cell):
+                handles.discard(handle)
+                if not handles:
+                    del self.cells[cell]
+
+    def update(self, entries):
+        """
+        Refresh the index from (handle, rect, window) entries, ordered topmost first.
+        Only windows that appeared, moved or resized touch the grid, the rest just get their z.
+        """
+        seen = set()
+        for z, (handle, rect, window) in enumerate(entries):
+            seen.add(handle)
+            if self.rects.get(handle) != rect:
+                self.remove(handle)
+                self.insert(handle, rect, z, window)
+            elif handle in self.rects:
+                self.z_order[handle] = z
+                self.windows[handle] = window
+
+        for handle in list(self.rects.keys() - seen):
+            self.remove(handle)
+
+    def window_at(self, x, y):
+        """Return the topmost window containing the point, or None."""
+        cell = (x // self.cell_size, y // self.cell_size)
+        best_handle = None
+        for handle in self.cells.get(cell, ()):
+            left, top, right, bottom = self.rects[handle]
+            if left <= x < right and top <= y < bottom:
+                if (
+                    best_handle is None
+                    or self.z_order[handle] < self.z_order[best_handle]
+                ):
+                    best_handle = handle
+        return self.windows.get(best_handle)
+
+    def clear(self):
+        self.cells = {}
+        self.rects = {}
+        self.z_order = {}
+        self.windows = {}
+
+
+class WindowMRUStack:
+    """Most recently focused windows, the focused one on top. Switching to the previous one is O(1)."""
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self.windows = OrderedDict()  # handle -> window object, the most recent last
+
+    def touch(self, handle, window):
+        self.windows[handle] = window
+        self.windows.move_to_end(handle)
+        if len(self.windows) > self.max_size:
+            self.windows.popitem(last=False)
+
+    def remove(self, handle):
+        self.windows.pop(handle, None)
+
+    def get_recent(self, depth=1):
+        """Return the (handle, window) focused 'depth' switches ago (0 is the focused one), or None."""
+        for position, handle in enumerate(reversed(self.windows)):
+            if position == depth:
+                return handle, self.windows[handle]
+        return None
+
+    def clear(self):
+        self.windows = OrderedDict()
+
+
+def get_trigrams(word):
+    return {word[i : i + 3] for i in range(len(word) - 2)}
+
+
+class TitleIndex:
+    def __init__(self):
+        self.entries = {}  # handle -> entry dict
+        self.order = []  # handles topmost first, as of the last update
+        self.by_trigram = {}  # trigram -> set of handles
+        self.by_prefix = {}  # first one or two letters of a word -> set of handles
+
+    def add(self, handle, title, app_name, window):
+        text = title.lower()
+        app_name = app_name.lower()
+        if app_name not in text:
+            text = f"{text} {app_name}"
+        words = WORD_PATTERN.findall(text)
+        trigrams = set()
+        prefixes = set()
+        for word in words:
+            trigrams |= get_trigrams(word)
+            prefixes.update((word[:1], word[:2]))
+        self.entries[handle] = {
+            "title": title,
+            "window": window,
+            "text": text,
+            "trigrams": trigrams,
+            "prefixes": prefixes,
+        }
+        for trigram in trigrams:
+            self.by_trigram.setdefault(trigram, set()).add(handle)
+        for prefix in prefixes:
+            self.by_prefix.setdefault(prefix, set()).add(handle)
+
+    def remove(self, handle):
+        entry = self.entries.pop(handle, None)
+        if not entry:
+            return
+        self.discard_from(self.by_trigram, entry["trigrams"], handle)
+        self.discard_from(self.by_prefix, entry["prefixes"], handle)
+
+    def discard_from(self, index, keys, handle):
+        for key in keys:
+            if handles := index.get(key):
+                handles.discard(handle)
+                if not handles:
+                    del index[key]
+
+    def update(self, entries, get_app_name):
+        """
+        Refresh the index from (handle, title, window) entries, ordered topmost first.
+        Only windows that opened or were renamed are (re)indexed, get_app_name(title) is called for them.
+        """
+        self.order = []
+        for handle, title, window in entries:
+            self.order.append(handle)
+            entry = self.entries.get(handle)
+            if entry and entry["title"] == title:
+                entry["window"] = window
+                continue
+            self.remove(handle)
+            self.add(handle, title, get_app_name(title), window)
+
+        for handle in self.entries.keys() - set(self.order):
+            self.remove(handle)
+
+    def search(self, query, limit=10):
+        """
+        Return up to 'limit' (handle, title, window) results for the query, best first.
+        Words of three letters or more are matched by trigrams and may have a typo or two,
+        shorter ones must start a word of the title. An empty query lists the windows topmost first.
+        """
+        query = query.lower().strip()
+        words = WORD_PATTERN.findall(query)
+        if not words:
+            return [self.get_result(handle) for handle in self.order[:limit]]
+
+        candidates = None
+        query_trigrams = set()
+        for word in words:
+            if len(word) < 3:
+                handles = self.by_prefix.get(word, set())
+                candidates = handles if candidates is None else candidates & handles
+            else:
+                query_trigrams |= get_trigrams(word)
+
+        overlaps = Counter()
+        for trigram in query_trigrams:
+            overlaps.update(self.by_trigram.get(trigram, ()))
+        if query_trigrams:
+            # At least half of the query's trigrams, so a typo still finds its window
+            needed = (len(query_trigrams) + 1) // 2
+            matches = [
+                handle
+                for handle, overlap in overlaps.items()
+                if overlap >= needed and (candidates is None or handle in candidates)
+            ]
+        else:
+            matches = list(candidates)
+
+        position = {handle: z for z, handle in enumerate(self.order)}
+        best = heapq.nsmallest(
+            limit,
+            matches,
+            key=lambda handle: (
+                -overlaps[handle],
+                query not in self.entries[handle]["text"],
+                position.get(handle, len(position)),
+            ),
+        )
+        return [self.get_result(handle) for handle in best]
+
+    def get_result(self, handle):
+        entry = self.entries[handle]
+        return handle, entry["title"], entry["window"]
+
+    def clear(self):
+        self.entries = {}
+        self.order = []
+        self.by_trigram = {}
+        self.by_prefix = {}
@@ -0,0 +1,94 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+The window state mirror keeps the state of the managed windows (alive, minimized, maximized, title,
+size and position) in memory, so hotkeys read it instead of querying the window manager.
+Every watched window gets a pywinctl watchdog, which calls back here when one of its states changes.
+The detector also updates the mirror right after its own calls, as the watchdog lags behind a bit.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class WindowStateMirror:
+    def __init__(self, interval=0.3):
+        # How often the watchdogs check their window
+        self.interval = interval
+        # The watchdogs call back on their own threads
+        self.lock = threading.Lock()
+        self.states = {}  # handle -> state dict
+
+    def watch(self, window):
+        """Start mirroring a window, reads its state once and then follows the changes."""
+        handle = window.getHandle()
+        with self.lock:
+            if handle in self.states and self.states[handle]["alive"]:
+                return
+        left, top, right, bottom = window.rect
+        state = {
+            "window": window,
+            "alive": True,
+            "minimized": window.isMinimized,
+            "maximized": window.isMaximized,
+            "title": window.title,
+            "size": (right - left, bottom - top),
+            "position": (left, top),
+        }
+        with self.lock:
+            self.states[handle] = state
+
+        def on_change(key):
+            return lambda value: self.update_state(handle, key, value)
+
+        window.watchdog.start(
+            isAliveCB=on_change("alive"),
+            isMinimizedCB=on_change("minimized"),
+            isMaximizedCB=on_change("maximized"),
+            resizedCB=on_change("size"),
+            movedCB=on_change("position"),
+            changedTitleCB=on_change("title"),
+            interval=self.interval,
+        )
+        logger.debug("Watching window %s", handle)
+
+    def unwatch(self, window):
+        with self.lock:
+            state = self.states.pop(window.getHandle(), None)
+        if state:
+            state["window"].watchdog.stop()
+
+    def stop(self):
+        with self.lock:
+            states = list(self.states.values())
+            self.states = {}
+        for state in states:
+            state["window"].watchdog.stop()
+
+    def update_state(self, handle, key, value):
+        with self.lock:
+            if state := self.states.get(handle):
+                state[key] = value
+        if key == "alive" and not value:
+            logger.debug("Watched window %s was closed", handle)
+
+    def set_state(self, window, **changes):
+        """Record the outcome of a call we just made, ahead of the watchdog."""
+        with self.lock:
+            if state := self.states.get(window.getHandle()):
+                state.update(changes)
+
+    def get_state(self, window):
+        """A copy of the mirrored state, or None when the window isn't watched."""
+        with self.lock:
+            if state := self.states.get(window.getHandle()):
+                return dict(state)
+        return None
+
+    def is_alive(self, window):
+        """False only for a watched window that was closed, unknown windows count as alive."""
+        with self.lock:
+            if state := self.states.get(window.getHandle()):
+                return state["alive"]
+        return True
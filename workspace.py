@@ -0,0 +1,209 @@
+"""
+~ BarakXYZ - XYZ Manager - 2024 - CS50x Final Project ~
+Workspaces save the state of every managed window (slot, exe, title, geometry and whether it's
+minimized or maximized), and bring it back with one hotkey.
+Restoring diffs the saved state against the live windows and only makes the window manager calls
+that are actually needed. A slot without its window takes an open window of the same app (by exe,
+then by title), and only apps that aren't running anymore are launched again.
+The snapshots are stored in cache.ini, a "Workspace <n>" section holding one entry per slot.
+The capture and restore functions call the window manager, so they run on the detector thread.
+"""
+
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_SECTION = "Workspace {}"
+SLOT_KEY = "slot {}"
+
+
+def read_window_state(window):
+    left, top, right, bottom = window.rect
+    if window.isMinimized:
+        state = "minimized"
+    elif window.isMaximized:
+        state = "maximized"
+    else:
+        state = "normal"
+    return {
+        "left": left,
+        "top": top,
+        "width": right - left,
+        "height": bottom - top,
+        "state": state,
+    }
+
+
+def get_live_window(detector, window_slot):
+    """The slot's window if it's still open, according to the detector's window registry."""
+    if not (window := window_slot["window_object"]):
+        return None
+    if detector.window_registry.get_record(window.getHandle()) is None:
+        return None
+    return window
+
+
+def find_running_window(detector, saved, claimed_handles):
+    """An open window of the saved app that isn't in a slot yet, matched by exe path then by title."""
+    records = [
+        record
+        for record in detector.window_registry.get_records()
+        if record["handle"] not in claimed_handles
+    ]
+    if exe_path := saved["exe_path"]:
+        exe_path = os.path.normcase(exe_path)
+        for record in records:
+            if record["pid"] is None:
+                continue
+            process = detector.process_index.get_by_pid(record["pid"])
+            if (
+                process
+                and process["exe"]
+                and os.path.normcase(process["exe"]) == exe_path
+            ):
+                return record["window"]
+    if title := (saved["title"] or "").lower():
+        for record in records:
+            if title in record["title_lower"]:
+                return record["window"]
+    return None
+
+
+def get_slot_context(slot, saved):
+    # Passed along with the window, so the slot is filled like a configured one
+    return {"slot": slot, "exe_path": saved["exe_path"], "window_title": saved["title"]}
+
+
+def capture_workspace(detector, window_slots):
+    """Return slot -> saved state for every slot whose window is open."""
+    detector.window_registry.refresh(force=True)
+    snapshot = {}
+    for slot, window_slot in enumerate(window_slots):
+        if not (window := get_live_window(detector, window_slot)):
+            continue
+        try:
+            saved = read_window_state(window)
+        except Exception as e:
+            # The window can close while it's being read
+            logger.debug("Skipping slot %s while capturing: %s", slot, e)
+            continue
+        saved["exe_path"] = window_slot["exe_path"]
+        saved["title"] = window_slot["window_title"] or window.title
+        snapshot[slot] = saved
+    return snapshot
+
+
+def plan_window_restore(saved, live):
+    """
+    Return the (window method, args) calls that bring a window from its live state to the saved one.
+    live is None for a window that was just launched, its geometry is unknown so everything is set.
+    """
+    live_state = live["state"] if live else None
+    if saved["state"] == "minimized":
+        return [] if live_state == "minimized" else [("minimize", ())]
+    if saved["state"] == "maximized":
+        return [] if live_state == "maximized" else [("maximize", ())]
+
+    steps = []
+    if live_state != "normal":
+        if live_state is not None:
+            steps.append(("restore", ()))
+        # The geometry read while minimized or maximized isn't the one it restores to
+        live = None
+    if not live or (live["left"], live["top"]) != (saved["left"], saved["top"]):
+        steps.append(("moveTo", (saved["left"], saved["top"])))
+    if not live or (live["width"], live["height"]) != (
+        saved["width"],
+        saved["height"],
+    ):
+        steps.append(("resizeTo", (saved["width"], saved["height"])))
+    return steps
+
+
+def apply_window_steps(window, steps):
+    for method_name, args in steps:
+        getattr(window, method_name)(*args)
+
+
+def restore_workspace(detector, snapshot, window_slots):
+    """Restore a captured workspace, returns slot -> what was done (for the debug terminal)."""
+    detector.window_registry.refresh(force=True)
+    report = {}
+    live_windows = {}
+    for slot, window_slot in enumerate(window_slots):
+        if window := get_live_window(detector, window_slot):
+            live_windows[slot] = window
+    claimed_handles = {window.getHandle() for window in live_windows.values()}
+
+    for slot, saved in snapshot.items():
+        found = ""
+        if not (window := live_windows.get(slot)):
+            # Empty after a restart, the app may well be running already
+            if window := find_running_window(detector, saved, claimed_handles):
+                claimed_handles.add(window.getHandle())
+                detector.window_opened.emit(get_slot_context(slot, saved), window)
+                found = "found running, "
+
+        if not window:
+            if not saved["exe_path"]:
+                report[slot] = "missing, no exe to launch"
+                continue
+            # Opened on the detector thread, the geometry is applied once the window shows up
+            future = detector.open_window_async(
+                saved["exe_path"], saved["title"], context=get_slot_context(slot, saved)
+            )
+            future.add_done_callback(
+                lambda future, saved=saved: restore_launched_window(future, saved)
+            )
+            report[slot] = "launching"
+            continue
+
+        try:
+            steps = plan_window_restore(saved, read_window_state(window))
+            apply_window_steps(window, steps)
+        except Exception as e:
+            report[slot] = f"failed: {e}"
+            continue
+        report[slot] = found + (", ".join(step[0] for step in steps) or "unchanged")
+
+    detector.window_registry.invalidate()
+    return report
+
+
+def restore_launched_window(future, saved):
+    if future.cancelled() or future.exception() or not (window := future.result()):
+        return
+    try:
+        apply_window_steps(window, plan_window_restore(saved, None))
+    except Exception as e:
+        logger.warning("Could not restore the launched window: %s", e)
+
+
+def save_workspace(user_config, number, snapshot):
+    user_config.update_ini_file(
+        "cache.ini",
+        {
+            WORKSPACE_SECTION.format(number): {
+                SLOT_KEY.format(slot): json.dumps(saved)
+                for slot, saved in snapshot.items()
+            }
+        },
+        replace_sections=True,
+    )
+
+
+def load_workspace(user_config, number):
+    """Return the saved slot -> state of a workspace, empty if it was never saved."""
+    cache_file = user_config.GOD["cache.ini"]["file"]
+    section = WORKSPACE_SECTION.format(number)
+    if not hasattr(cache_file, "has_section") or not cache_file.has_section(section):
+        return {}
+    snapshot = {}
+    for key, value in cache_file.items(section):
+        try:
+            snapshot[int(key.split()[-1])] = json.loads(value)
+        except ValueError:
+            logger.warning("Skipping a malformed %s entry: %s", section, key)
+    return snapshot